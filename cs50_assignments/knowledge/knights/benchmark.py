@@ -0,0 +1,72 @@
+import itertools
+import time
+
+from cs50_assignments.knowledge.knights.logic import model_check_all, simplify
+from cs50_assignments.knowledge.knights.puzzle import (
+    AKnave,
+    AKnight,
+    BKnave,
+    BKnight,
+    CKnave,
+    CKnight,
+    knowledge0,
+    knowledge1,
+    knowledge2,
+    knowledge3,
+)
+
+REPEATS = 200
+
+
+def main():
+    symbols = [AKnight, AKnave, BKnight, BKnave, CKnight, CKnave]
+    puzzles = [
+        ("Puzzle 0", knowledge0),
+        ("Puzzle 1", knowledge1),
+        ("Puzzle 2", knowledge2),
+        ("Puzzle 3", knowledge3),
+    ]
+
+    print("Model enumeration nodes visited (pruned / exhaustive)")
+    for puzzle, knowledge in puzzles:
+        stats = {}
+        model_check_all(knowledge, symbols, stats)
+        exhaustive = 2 ** (len(symbols) + 1) - 1
+        print(f"  {puzzle}: {stats['nodes']} / {exhaustive}")
+
+    print("Knowledge base size and evaluation time (before -> after simplify)")
+    models = [
+        {symbol.name: value for symbol, value in zip(symbols, values)}
+        for values in itertools.product((True, False), repeat=len(symbols))
+    ]
+    for puzzle, knowledge in puzzles:
+        simplified = simplify(knowledge)
+        print(
+            f"  {puzzle}: {tree_size(knowledge)} -> {tree_size(simplified)} nodes, "
+            f"{evaluation_time(knowledge, models) * 1000:.2f}ms -> "
+            f"{evaluation_time(simplified, models) * 1000:.2f}ms"
+        )
+
+
+def tree_size(sentence):
+    """
+    Returns the number of nodes in sentence, counting shared
+    subformulas once per occurrence.
+    """
+    return 1 + sum(tree_size(child) for child in sentence._children())
+
+
+def evaluation_time(knowledge, models):
+    """
+    Returns the time taken to evaluate knowledge in every model,
+    `REPEATS` times over.
+    """
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for model in models:
+            knowledge.evaluate(model)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
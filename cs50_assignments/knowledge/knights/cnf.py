@@ -0,0 +1,135 @@
+from cs50_assignments.knowledge.knights.logic import (
+    FALSE,
+    TRUE,
+    And,
+    Biconditional,
+    Not,
+    Or,
+    Symbol,
+    simplify,
+)
+
+
+class Clausifier:
+    """
+    Converts logical sentences into conjunctive normal form.
+
+    Clauses are tuples of integer literals in the DIMACS style: symbol
+    `k` is the literal `k` and its negation is `-k`. Subformulas that are
+    not already clauses get a fresh variable through the Tseitin
+    transformation, which keeps the output linear in the input size.
+    """
+
+    def __init__(self):
+        self.ids = dict()
+        self.names = [None]
+        self.definitions = dict()
+
+    def variable(self, name=None):
+        """
+        Returns the variable of the symbol `name`, allocating it on first
+        use. Without a name a fresh auxiliary variable is returned.
+        """
+        if name is not None and name in self.ids:
+            return self.ids[name]
+        variable = len(self.names)
+        self.names.append(name)
+        if name is not None:
+            self.ids[name] = variable
+        return variable
+
+    def name(self, literal):
+        """Returns the symbol name of a literal, or None if auxiliary."""
+        return self.names[abs(literal)]
+
+    def clauses(self, sentence):
+        """Returns a list of clauses equivalent to sentence."""
+        sentence = simplify(sentence)
+        if sentence is TRUE:
+            return []
+        if sentence is FALSE:
+            return [()]
+
+        conjuncts = sentence.conjuncts if isinstance(sentence, And) else (sentence,)
+        clauses = []
+        for conjunct in conjuncts:
+            disjuncts = conjunct.disjuncts if isinstance(conjunct, Or) else (conjunct,)
+            for disjunct in disjuncts:
+                if self._literal(disjunct) is None:
+                    clauses.extend(self._define(disjunct))
+            clause = normalize([self._literal(disjunct) for disjunct in disjuncts])
+            if clause is not None:
+                clauses.append(clause)
+        return clauses
+
+    def literal(self, sentence):
+        """
+        Returns a literal equivalent to sentence together with the
+        clauses defining it.
+        """
+        sentence = simplify(sentence)
+        clauses = [] if self._literal(sentence) is not None else self._define(sentence)
+        return self._literal(sentence), clauses
+
+    def _literal(self, sentence):
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not) and isinstance(sentence.operand, Symbol):
+            return -self.variable(sentence.operand.name)
+        return self.definitions.get(sentence)
+
+    def _define(self, sentence):
+        """
+        Gives every undefined compound subformula of sentence a Tseitin
+        variable and returns the new defining clauses.
+        """
+        clauses = []
+        stack = [(sentence, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if self._literal(node) is not None:
+                continue
+
+            children = node._children()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+
+            if node is TRUE or node is FALSE:
+                variable = self.variable()
+                clauses.append((variable,) if node is TRUE else (-variable,))
+                self.definitions[node] = variable
+                continue
+
+            operands = [self._literal(child) for child in children]
+            variable = self.variable()
+            if isinstance(node, And):
+                clauses.extend((-variable, operand) for operand in operands)
+                clauses.append((variable, *[-operand for operand in operands]))
+            elif isinstance(node, Or):
+                clauses.extend((variable, -operand) for operand in operands)
+                clauses.append((-variable, *operands))
+            elif isinstance(node, Biconditional):
+                left, right = operands
+                clauses.append((-variable, -left, right))
+                clauses.append((-variable, left, -right))
+                clauses.append((variable, left, right))
+                clauses.append((variable, -left, -right))
+            else:
+                raise TypeError(f"can not convert {type(node).__name__} to CNF")
+            self.definitions[node] = variable
+
+        return [clause for clause in map(normalize, clauses) if clause is not None]
+
+
+def normalize(clause):
+    """
+    Removes duplicate literals from a clause, returning None if the
+    clause is a tautology.
+    """
+    literals = tuple(dict.fromkeys(clause))
+    seen = set(literals)
+    if any(-literal in seen for literal in literals):
+        return None
+    return literals
@@ -1,15 +1,110 @@
+import weakref
+from functools import partial
+from operator import methodcaller
+
+# Stands in for a truth value where there is none
+_NO_VALUE = object()
+
+# Deeper knowledge bases are evaluated without recursion when model checking
+MAX_RECURSIVE_DEPTH = 200
+
+
 class Sentence:
+    """
+    Immutable, hash-consed logical sentence.
+
+    Structurally identical sentences are built once and shared, so equality
+    is identity and each node caches its hash and depth, and its symbol set
+    and formula once first asked for.
+    """
+
+    __slots__ = ("_hash", "_depth", "_symbols", "_formula", "__weakref__")
+
+    _interned = weakref.WeakValueDictionary()
+
+    # How tightly the connective binds when formatting formulas
+    _precedence = 0
+
+    # Value of an operand that decides the value of the sentence on its own
+    _absorbing = _NO_VALUE
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return _render(self, methodcaller("_repr_parts"))
+
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
 
+    def evaluate_partial(self, model):
+        """
+        Evaluates the logical sentence in a partial model, returning
+        None when the value depends on symbols the model does not assign.
+        """
+        raise Exception("nothing to evaluate")
+
     def formula(self):
         """Returns string formula representing logical sentence."""
-        return ""
+        if self._formula is None:
+            formula = _render(self, methodcaller("_formula_parts"))
+            object.__setattr__(self, "_formula", formula)
+        return self._formula
 
     def symbols(self):
-        """Returns a set of all symbols in the logical sentence."""
-        return set()
+        """Returns a frozenset of all symbols in the logical sentence."""
+        if self._symbols is None:
+            object.__setattr__(self, "_symbols", _collect_symbols(self))
+        return self._symbols
+
+    def _children(self):
+        return ()
+
+    def _partial_value(self, values):
+        """
+        Returns the value of the sentence in a partial model given
+        the values of its operands in that model.
+        """
+        raise Exception("nothing to evaluate")
+
+    def _formula_parts(self):
+        """Returns the strings and operand sentences making up the formula."""
+        return []
+
+    def _repr_parts(self):
+        parts = [f"{type(self).__name__}("]
+        for i, child in enumerate(self._children()):
+            if i:
+                parts.append(", ")
+            parts.append(child)
+        parts.append(")")
+        return parts
+
+    @classmethod
+    def _intern(cls, key, **fields):
+        """Returns the shared sentence for `key`, building it on first use."""
+        sentence = Sentence._interned.get(key)
+        if sentence is None:
+            sentence = object.__new__(cls)
+            for name, value in fields.items():
+                object.__setattr__(sentence, name, value)
+            object.__setattr__(sentence, "_hash", hash(key))
+            depth = 1 + max((child._depth for child in sentence._children()), default=0)
+            object.__setattr__(sentence, "_depth", depth)
+            object.__setattr__(sentence, "_symbols", None)
+            object.__setattr__(sentence, "_formula", None)
+            Sentence._interned[key] = sentence
+        return sentence
 
     @classmethod
     def validate(cls, sentence):
@@ -43,17 +138,14 @@ class Sentence:
 
 
 class Symbol(Sentence):
-    def __init__(self, name):
-        self.name = name
+    _precedence = 6
+    __slots__ = ("name",)
 
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+    def __new__(cls, name):
+        return cls._intern((cls, name), name=name)
 
-    def __hash__(self):
-        return hash(("symbol", self.name))
-
-    def __repr__(self):
-        return self.name
+    def __reduce__(self):
+        return (type(self), (self.name,))
 
     def evaluate(self, model):
         try:
@@ -61,199 +153,609 @@ class Symbol(Sentence):
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
-    def formula(self):
-        return self.name
+    def evaluate_partial(self, model):
+        value = model.get(self.name)
+        return None if value is None else bool(value)
 
-    def symbols(self):
-        return {self.name}
+    def _formula_parts(self):
+        return [self.name]
 
+    def _repr_parts(self):
+        return [self.name]
 
-class Not(Sentence):
-    def __init__(self, operand):
-        Sentence.validate(operand)
-        self.operand = operand
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+class Not(Sentence):
+    _precedence = 5
+    __slots__ = ("operand",)
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    def __new__(cls, operand):
+        Sentence.validate(operand)
+        return cls._intern((cls, operand), operand=operand)
 
-    def __repr__(self):
-        return f"Not({self.operand})"
+    def __reduce__(self):
+        return (type(self), (self.operand,))
 
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
-    def formula(self):
-        return "¬" + Sentence.parenthesize(self.operand.formula())
+    def evaluate_partial(self, model):
+        value = self.operand.evaluate_partial(model)
+        return None if value is None else not value
 
-    def symbols(self):
-        return self.operand.symbols()
+    def _partial_value(self, values):
+        (value,) = values
+        return None if value is None else not value
+
+    def _children(self):
+        return (self.operand,)
+
+    def _formula_parts(self):
+        return ["¬", *_operand(self.operand, self._precedence - 1)]
 
 
 class And(Sentence):
-    def __init__(self, *conjuncts):
+    _precedence = 4
+    _absorbing = False
+    __slots__ = ("conjuncts",)
+
+    def __new__(cls, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
-
-    def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return cls._intern((cls, conjuncts), conjuncts=conjuncts)
 
-    def __hash__(self):
-        return hash(("and", tuple(hash(conjunct) for conjunct in self.conjuncts)))
-
-    def __repr__(self):
-        conjunctions = ", ".join([str(conjunct) for conjunct in self.conjuncts])
-        return f"And({conjunctions})"
+    def __reduce__(self):
+        return (type(self), self.conjuncts)
 
     def add(self, conjunct):
-        Sentence.validate(conjunct)
-        self.conjuncts.append(conjunct)
+        """
+        Raises TypeError, as sentences are immutable and a conjunction
+        cannot be extended in place. Build a new one with
+        And(*knowledge.conjuncts, conjunct) instead.
+        """
+        raise TypeError(
+            "And is immutable; build a new conjunction with "
+            "And(*knowledge.conjuncts, conjunct)"
+        )
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
-    def formula(self):
-        if len(self.conjuncts) == 1:
-            return self.conjuncts[0].formula()
-        return " ∧ ".join(
-            [Sentence.parenthesize(conjunct.formula()) for conjunct in self.conjuncts]
-        )
+    def evaluate_partial(self, model):
+        result = True
+        for conjunct in self.conjuncts:
+            value = conjunct.evaluate_partial(model)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    def _partial_value(self, values):
+        if False in values:
+            return False
+        return None if None in values else True
+
+    def _children(self):
+        return self.conjuncts
+
+    def _formula_parts(self):
+        return _junction_parts(self.conjuncts, " ∧ ", "⊤", self._precedence)
 
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    _precedence = 3
+    _absorbing = True
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls._intern((cls, disjuncts), disjuncts=disjuncts)
 
-    def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
-
-    def __hash__(self):
-        return hash(("or", tuple(hash(disjunct) for disjunct in self.disjuncts)))
-
-    def __repr__(self):
-        disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
-        return f"Or({disjuncts})"
+    def __reduce__(self):
+        return (type(self), self.disjuncts)
 
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
-    def formula(self):
-        if len(self.disjuncts) == 1:
-            return self.disjuncts[0].formula()
-        return " ∨  ".join(
-            [Sentence.parenthesize(disjunct.formula()) for disjunct in self.disjuncts]
-        )
+    def evaluate_partial(self, model):
+        result = False
+        for disjunct in self.disjuncts:
+            value = disjunct.evaluate_partial(model)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+
+    def _partial_value(self, values):
+        if True in values:
+            return True
+        return None if None in values else False
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    def _children(self):
+        return self.disjuncts
+
+    def _formula_parts(self):
+        return _junction_parts(self.disjuncts, " ∨ ", "⊥", self._precedence)
 
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    _precedence = 2
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
-
-    def __eq__(self, other):
-        return (
-            isinstance(other, Implication)
-            and self.antecedent == other.antecedent
-            and self.consequent == other.consequent
+        return cls._intern(
+            (cls, antecedent, consequent),
+            antecedent=antecedent,
+            consequent=consequent,
         )
 
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
-
-    def __repr__(self):
-        return f"Implication({self.antecedent}, {self.consequent})"
+    def __reduce__(self):
+        return (type(self), (self.antecedent, self.consequent))
 
     def evaluate(self, model):
         return (not self.antecedent.evaluate(model)) or self.consequent.evaluate(model)
 
-    def formula(self):
-        antecedent = Sentence.parenthesize(self.antecedent.formula())
-        consequent = Sentence.parenthesize(self.consequent.formula())
-        return f"{antecedent} => {consequent}"
+    def evaluate_partial(self, model):
+        antecedent = self.antecedent.evaluate_partial(model)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.evaluate_partial(model)
+        if consequent is True:
+            return True
+        if antecedent is True and consequent is False:
+            return False
+        return None
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    def _partial_value(self, values):
+        antecedent, consequent = values
+        if antecedent is False or consequent is True:
+            return True
+        if antecedent is True and consequent is False:
+            return False
+        return None
+
+    def _children(self):
+        return (self.antecedent, self.consequent)
+
+    def _formula_parts(self):
+        return [
+            *_operand(self.antecedent, self._precedence),
+            " => ",
+            *_operand(self.consequent, self._precedence),
+        ]
 
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    _precedence = 1
+    _absorbing = None
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls._intern((cls, left, right), left=left, right=right)
 
-    def __eq__(self, other):
-        return (
-            isinstance(other, Biconditional)
-            and self.left == other.left
-            and self.right == other.right
-        )
-
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
-
-    def __repr__(self):
-        return f"Biconditional({self.left}, {self.right})"
+    def __reduce__(self):
+        return (type(self), (self.left, self.right))
 
     def evaluate(self, model):
         return (self.left.evaluate(model) and self.right.evaluate(model)) or (
             not self.left.evaluate(model) and not self.right.evaluate(model)
         )
 
-    def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
-        return f"{left} <=> {right}"
+    def evaluate_partial(self, model):
+        left = self.left.evaluate_partial(model)
+        if left is None:
+            return None
+        right = self.right.evaluate_partial(model)
+        if right is None:
+            return None
+        return left == right
+
+    def _partial_value(self, values):
+        left, right = values
+        if left is None or right is None:
+            return None
+        return left == right
+
+    def _children(self):
+        return (self.left, self.right)
+
+    def _formula_parts(self):
+        return [
+            *_operand(self.left, self._precedence),
+            " <=> ",
+            *_operand(self.right, self._precedence),
+        ]
+
+
+def _collect_symbols(sentence):
+    """
+    Returns the names of the symbols in sentence without recursion,
+    reusing the symbol sets already cached by its subsentences
+    """
+    names = set()
+    stack = [sentence]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        if node is not sentence and node._symbols is not None:
+            names.update(node._symbols)
+        elif isinstance(node, Symbol):
+            names.add(node.name)
+        else:
+            stack.extend(node._children())
+    return frozenset(names)
+
+
+def _evaluate_partial(sentence, model):
+    """
+    Evaluates sentence in a partial model without recursion, leaving the
+    remaining operands of a sentence once one has its absorbing value
+    """
+    if isinstance(sentence, Symbol):
+        return sentence.evaluate_partial(model)
+
+    # Sentences being evaluated, their operands left to evaluate and the
+    # values of those evaluated so far
+    stack = [(sentence, iter(sentence._children()), [])]
+    while True:
+        node, operands, values = stack[-1]
+        value = _NO_VALUE
+        for operand in operands:
+            if not isinstance(operand, Symbol):
+                stack.append((operand, iter(operand._children()), []))
+                break
+            operand_value = operand.evaluate_partial(model)
+            if operand_value is node._absorbing:
+                value = operand_value
+                break
+            values.append(operand_value)
+        else:
+            value = node._partial_value(values)
+        if value is _NO_VALUE:
+            continue
+
+        # Pass the value up to the sentences it decides
+        stack.pop()
+        while stack:
+            node, _, values = stack[-1]
+            if value is not node._absorbing:
+                values.append(value)
+                break
+            stack.pop()
+        else:
+            return value
+
+
+def _partial_evaluator(sentence):
+    """
+    Returns a function evaluating sentence in a partial model, which only
+    avoids recursion when sentence is too deep to recurse through.
+    """
+    if sentence._depth <= MAX_RECURSIVE_DEPTH:
+        return sentence.evaluate_partial
+    return partial(_evaluate_partial, sentence)
+
+
+def _render(sentence, parts_of):
+    """
+    Renders sentence without recursion, expanding each sentence into the
+    strings and operand sentences `parts_of` returns for it.
+    """
+    output = []
+    stack = [sentence]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            output.append(item)
+        else:
+            stack.extend(reversed(parts_of(item)))
+    return "".join(output)
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
 
+def _operand(sentence, precedence):
+    """
+    Returns the formula parts of an operand, parenthesized unless it
+    binds more tightly than `precedence`.
+    """
+    # A junction of one operand is formatted as that operand
+    while isinstance(sentence, (And, Or)) and len(sentence._children()) == 1:
+        sentence = sentence._children()[0]
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    if isinstance(sentence, Symbol):
+        parenthesize = not sentence.name.isalpha()
+    elif not sentence._children():
+        parenthesize = False
+    else:
+        parenthesize = sentence._precedence <= precedence
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
+    part = sentence if sentence._formula is None else sentence._formula
+    return ["(", part, ")"] if parenthesize else [part]
 
-        # If model has an assignment for each symbol
-        if not symbols:
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
 
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
+def _junction_parts(operands, separator, empty, precedence):
+    """Returns the formula parts of an And or Or of operands."""
+    if not operands:
+        return [empty]
+    if len(operands) == 1:
+        return [operands[0]]
 
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
+    parts = []
+    for i, operand in enumerate(operands):
+        if i:
+            parts.append(separator)
+        parts.extend(_operand(operand, precedence))
+    return parts
 
-            # Ensure entailment holds in both models
-            return check_all(knowledge, query, remaining, model_true) and check_all(
-                knowledge, query, remaining, model_false
-            )
 
-    # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+# The empty conjunction and disjunction serve as the logical constants
+TRUE = And()
+FALSE = Or()
+
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+def model_check(knowledge, query, stats=None):
+    """
+    Checks if knowledge base entails query.
+
+    If a `stats` dictionary is given, the number of nodes visited in the
+    model enumeration is accumulated under `stats["nodes"]`.
+    """
+
+    knowledge = simplify(knowledge)
+
+    # Get all symbols in both knowledge and query
+    symbols = _ordered_symbols(knowledge, [query])
+
+    # Check that query is true in every model of the knowledge base
+    return all(
+        query.evaluate(model)
+        for model in _models(_partial_evaluator(knowledge), symbols, 0, dict(), stats)
+    )
+
+
+def model_check_all(knowledge, queries, stats=None):
+    """
+    Checks many queries against a knowledge base, enumerating the models
+    of the knowledge base only once.
+
+    Returns a dictionary mapping each query to True if the knowledge base
+    entails it, False if the knowledge base entails its negation, and None
+    if it is undetermined. `stats` is accumulated as in `model_check`.
+    """
+    knowledge = simplify(knowledge)
+    queries = list(dict.fromkeys(queries))
+    seen_true = set()
+    seen_false = set()
+
+    # Get all symbols in knowledge and every query
+    symbols = _ordered_symbols(knowledge, queries)
+
+    open_queries = queries
+    for model in _models(_partial_evaluator(knowledge), symbols, 0, dict(), stats):
+        for query in open_queries:
+            if query.evaluate(model):
+                seen_true.add(query)
+            else:
+                seen_false.add(query)
+
+        # A query seen both true and false can not become determined again
+        open_queries = [
+            query
+            for query in open_queries
+            if query not in seen_true or query not in seen_false
+        ]
+        if not open_queries:
+            break
+
+    results = {}
+    for query in queries:
+        if query not in seen_false:
+            results[query] = True
+        elif query not in seen_true:
+            results[query] = False
+        else:
+            results[query] = None
+    return results
+
+
+def simplify(sentence):
+    """
+    Returns an equivalent, simplified sentence.
+
+    Not is pushed inward onto symbols and implications are rewritten as
+    disjunctions. Nested And/Or are flattened, duplicate and absorbed terms
+    removed and constants folded into TRUE or FALSE.
+    """
+    simplified = dict()
+
+    # Post-order walk over (sentence, polarity) pairs, without recursion
+    stack = [(sentence, True, False)]
+    while stack:
+        node, positive, expanded = stack.pop()
+        if (node, positive) in simplified:
+            continue
+
+        children = _polarized_children(node, positive)
+        if not expanded:
+            stack.append((node, positive, True))
+            for child, child_positive in children:
+                if (child, child_positive) not in simplified:
+                    stack.append((child, child_positive, False))
+            continue
+
+        operands = [simplified[child] for child in children]
+        simplified[(node, positive)] = _combine(node, positive, operands)
+
+    return simplified[(sentence, True)]
+
+
+def _polarized_children(sentence, positive):
+    """Returns the (child, polarity) pairs a sentence is simplified from."""
+    if isinstance(sentence, Not):
+        return [(sentence.operand, not positive)]
+    if isinstance(sentence, Implication):
+        return [(sentence.antecedent, not positive), (sentence.consequent, positive)]
+    if isinstance(sentence, Biconditional):
+        return [(sentence.left, True), (sentence.right, positive)]
+    return [(child, positive) for child in sentence._children()]
+
+
+def _combine(sentence, positive, operands):
+    """Builds the simplified form of a sentence from simplified operands."""
+    if isinstance(sentence, Symbol):
+        return sentence if positive else Not(sentence)
+    if isinstance(sentence, Not):
+        return operands[0]
+    if isinstance(sentence, Biconditional):
+        return _simplify_biconditional(*operands)
+
+    # Implication becomes a disjunction, negation swaps And and Or
+    conjunctive = isinstance(sentence, And)
+    if not positive:
+        conjunctive = not conjunctive
+    return _simplify_junction(And if conjunctive else Or, operands)
+
+
+def _simplify_junction(junction, operands):
+    """Flattens, deduplicates, absorbs and folds an And or Or of operands."""
+    dual = Or if junction is And else And
+    identity, annihilator = (TRUE, FALSE) if junction is And else (FALSE, TRUE)
+
+    terms = dict()
+    for operand in operands:
+        nested = operand._children() if isinstance(operand, junction) else (operand,)
+        for term in nested:
+            if term is annihilator:
+                return annihilator
+            if term is not identity:
+                terms[term] = None
+
+    # A term alongside its complement decides the whole junction
+    for term in terms:
+        if isinstance(term, Not) and term.operand in terms:
+            return annihilator
+
+    # Absorption: A ∧ (A ∨ B) is A, and A ∨ (A ∧ B) is A
+    terms = [
+        term
+        for term in terms
+        if not (
+            isinstance(term, dual) and any(child in terms for child in term._children())
+        )
+    ]
+
+    if not terms:
+        return identity
+    if len(terms) == 1:
+        return terms[0]
+    return junction(*terms)
+
+
+def _simplify_biconditional(left, right):
+    """Folds constants and trivial cases out of a biconditional."""
+    if left is right:
+        return TRUE
+    if left is _complement(right) or right is _complement(left):
+        return FALSE
+    for constant, other in ((left, right), (right, left)):
+        if constant is TRUE:
+            return other
+        if constant is FALSE and _complement(other) is not None:
+            return _complement(other)
+    return Biconditional(left, right)
+
+
+def _complement(sentence):
+    """Returns the complement of a literal or constant, otherwise None."""
+    if isinstance(sentence, Symbol):
+        return Not(sentence)
+    if isinstance(sentence, Not):
+        return sentence.operand
+    if sentence is TRUE:
+        return FALSE
+    if sentence is FALSE:
+        return TRUE
+    return None
+
+
+def _models(evaluate_partial, symbols, index, model, stats=None, decided=False):
+    """
+    Yields every extension of `model` over `symbols[index:]` in which
+    knowledge is true, pruning a branch as soon as the partial model makes
+    knowledge false. `evaluate_partial` evaluates knowledge in a partial
+    model. The yielded dictionary is reused between models.
+    """
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + 1
+
+    # Once knowledge is decided true, every extension is a model of it
+    if not decided:
+        value = evaluate_partial(model)
+        if value is False:
+            return
+        decided = value is True
+
+    if index == len(symbols):
+        yield model
+        return
+
+    p = symbols[index]
+    for value in (True, False):
+        model[p] = value
+        yield from _models(evaluate_partial, symbols, index + 1, model, stats, decided)
+    del model[p]
+
+
+def _ordered_symbols(knowledge, queries):
+    """
+    Returns the symbols of knowledge and queries, those occurring most
+    often in knowledge first so that branches are decided early.
+    """
+    frequencies = _symbol_frequencies(knowledge, dict())
+    symbols = knowledge.symbols().union(*[query.symbols() for query in queries])
+    return sorted(symbols, key=lambda symbol: (-frequencies.get(symbol, 0), symbol))
+
+
+def _symbol_frequencies(sentence, memo):
+    """
+    Counts the occurrences of each symbol in sentence without recursion,
+    counting each subsentence once its operands are counted
+    """
+    if isinstance(sentence, Symbol):
+        return {sentence.name: 1}
+
+    stack = [sentence]
+    while stack:
+        node = stack[-1]
+        if node in memo:
+            stack.pop()
+            continue
+
+        children = node._children()
+        uncounted = [
+            child
+            for child in children
+            if not isinstance(child, Symbol) and child not in memo
+        ]
+        if uncounted:
+            stack.extend(uncounted)
+            continue
+
+        frequencies = {}
+        for child in children:
+            if isinstance(child, Symbol):
+                frequencies[child.name] = frequencies.get(child.name, 0) + 1
+                continue
+            for symbol, count in memo[child].items():
+                frequencies[symbol] = frequencies.get(symbol, 0) + count
+        memo[node] = frequencies
+        stack.pop()
+    return memo[sentence]
@@ -0,0 +1,158 @@
+import re
+import sys
+
+from cs50_assignments.knowledge.knights.cnf import Clausifier, normalize
+from cs50_assignments.knowledge.knights.logic import (
+    FALSE,
+    TRUE,
+    And,
+    Biconditional,
+    Implication,
+    Not,
+    Or,
+    Symbol,
+)
+
+TOKENS = re.compile(r"<=>|=>|[¬∧∨()⊤⊥]|[^¬∧∨()⊤⊥<=]+|.")
+
+# Binding strength of each operator
+PRECEDENCE = {"¬": 5, "∧": 4, "∨": 3, "=>": 2, "<=>": 1}
+CONSTANTS = {"⊤": TRUE, "⊥": FALSE}
+
+
+def parse(text):
+    """
+    Parses a formula in the syntax produced by `Sentence.formula`,
+    e.g. "(A ∨ B) ∧ ¬C => D", into a Sentence.
+
+    Chains of the same ∧ or ∨ operator become a single And or Or, and
+    parentheses are kept as nesting, so formulas round-trip exactly.
+    """
+    operands = []
+    operators = []
+    expect_operand = True
+
+    for token in TOKENS.findall(text):
+        token = token.strip()
+        if not token:
+            continue
+
+        if token in PRECEDENCE and token != "¬":
+            if expect_operand:
+                raise ValueError(f"unexpected {token!r} in formula {text!r}")
+            # ∧ and ∨ chains are merged below, => and <=> are right associative,
+            # so only strictly tighter operators are reduced
+            while (
+                operators
+                and operators[-1][0] != "("
+                and PRECEDENCE[operators[-1][0]] > PRECEDENCE[token]
+            ):
+                _reduce(operands, operators)
+            if token in ("∧", "∨") and operators and operators[-1][0] == token:
+                operators[-1][1] += 1
+            else:
+                operators.append([token, 2])
+            expect_operand = True
+        elif token == "¬" or token == "(":
+            if not expect_operand:
+                raise ValueError(f"unexpected {token!r} in formula {text!r}")
+            operators.append([token, 1])
+        elif token == ")":
+            if expect_operand:
+                raise ValueError(f"unexpected ')' in formula {text!r}")
+            while operators and operators[-1][0] != "(":
+                _reduce(operands, operators)
+            if not operators:
+                raise ValueError(f"unbalanced parentheses in formula {text!r}")
+            operators.pop()
+        elif token in "<=":
+            raise ValueError(f"unexpected {token!r} in formula {text!r}")
+        else:
+            if not expect_operand:
+                raise ValueError(f"unexpected {token!r} in formula {text!r}")
+            if token in CONSTANTS:
+                operands.append(CONSTANTS[token])
+            else:
+                operands.append(Symbol(sys.intern(token)))
+            expect_operand = False
+
+    if expect_operand:
+        raise ValueError(f"incomplete formula {text!r}")
+    while operators:
+        if operators[-1][0] == "(":
+            raise ValueError(f"unbalanced parentheses in formula {text!r}")
+        _reduce(operands, operators)
+    return operands[0]
+
+
+def _reduce(operands, operators):
+    """Applies the operator on top of the stack to its operands."""
+    operator, arity = operators.pop()
+    arguments = operands[-arity:]
+    del operands[-arity:]
+    if operator == "¬":
+        operands.append(Not(*arguments))
+    elif operator == "∧":
+        operands.append(And(*arguments))
+    elif operator == "∨":
+        operands.append(Or(*arguments))
+    elif operator == "=>":
+        operands.append(Implication(*arguments))
+    else:
+        operands.append(Biconditional(*arguments))
+
+
+def load(path):
+    """
+    Streams the formulas of a rule file, one per line, as Sentences.
+    Blank lines and lines starting with "#" are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield parse(line)
+
+
+def load_clauses(path, clausifier=None):
+    """
+    Streams the formulas of a rule file as CNF clauses over the variables
+    of `clausifier` (a new Clausifier by default).
+
+    Lines that are already clauses, such as "A ∨ ¬B ∨ C", are split
+    directly without building Sentences.
+    """
+    if clausifier is None:
+        clausifier = Clausifier()
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            clause = _split_clause(line, clausifier)
+            if clause is None:
+                yield from clausifier.clauses(parse(line))
+            else:
+                clause = normalize(clause)
+                if clause is not None:
+                    yield clause
+
+
+def _split_clause(line, clausifier):
+    """Returns line as a clause if it is a plain disjunction of literals."""
+    if any(operator in line for operator in ("∧", "=>", "(", ")", "⊤", "⊥")):
+        return None
+
+    clause = []
+    for literal in line.split("∨"):
+        literal = literal.strip()
+        negated = literal.startswith("¬")
+        if negated:
+            literal = literal[1:].strip()
+        if not literal or "¬" in literal or "<" in literal or "=" in literal:
+            return None
+        variable = clausifier.variable(sys.intern(literal))
+        clause.append(-variable if negated else variable)
+    return clause
@@ -1,4 +1,10 @@
-from cs50_assignments.knowledge.knights.logic import And, Not, Or, Symbol, model_check
+from cs50_assignments.knowledge.knights.logic import (
+    And,
+    Not,
+    Or,
+    Symbol,
+    model_check_all,
+)
 
 AKnight = Symbol("A is a Knight")
 AKnave = Symbol("A is a Knave")
@@ -70,8 +76,9 @@ def main():
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
+            results = model_check_all(knowledge, symbols)
             for symbol in symbols:
-                if model_check(knowledge, symbol):
+                if results[symbol]:
                     print(f"    {symbol}")
 
 
@@ -0,0 +1,276 @@
+import heapq
+
+from cs50_assignments.knowledge.knights.cnf import Clausifier
+
+
+class Reasoner:
+    """
+    Incremental entailment checker over a growing knowledge base.
+
+    Sentences are converted to CNF clauses and checked with a conflict
+    driven clause learning (CDCL) SAT solver. Clauses learned while
+    answering one query, and every fact propagated without assumptions,
+    are kept for the next one, so extending the knowledge base or asking
+    what-if questions costs roughly the size of the change.
+    """
+
+    def __init__(self):
+        self.clausifier = Clausifier()
+        self.clauses = []
+        self.learned = []
+        self.inconsistent = False
+
+        # Watched literal scheme: each clause is watched by its first
+        # two literals and only visited when one of them becomes false
+        self.watches = dict()
+
+        # Assignment state; decision level 0 holds permanent facts
+        self.values = dict()
+        self.levels = dict()
+        self.reasons = dict()
+        self.trail = []
+        self.trail_limits = []
+        self.propagated = 0
+
+        # Variable activity for the decision heuristic
+        self.activity = dict()
+        self.queue = []
+        self.increment = 1.0
+
+        # Variables up to this one have been queued; every unassigned
+        # variable stays in the queue, along with stale entries
+        self.queued = 0
+
+    def add(self, sentence):
+        """Adds a sentence to the knowledge base."""
+        for clause in self.clausifier.clauses(sentence):
+            self._add_clause(list(clause))
+
+    def satisfiable(self, assumptions=()):
+        """
+        Checks if the knowledge base is satisfiable
+        when all sentences in `assumptions` are true.
+        """
+        literals = [self._literal(assumption) for assumption in assumptions]
+        return self._solve(literals)
+
+    def entails(self, query, assumptions=()):
+        """
+        Checks if the knowledge base, together with the sentences in
+        `assumptions`, entails query.
+        """
+        literals = [self._literal(assumption) for assumption in assumptions]
+        return not self._solve(literals + [-self._literal(query)])
+
+    def _literal(self, sentence):
+        """
+        Returns a literal equivalent to sentence, permanently adding
+        the clauses that define it.
+        """
+        literal, clauses = self.clausifier.literal(sentence)
+        for clause in clauses:
+            self._add_clause(list(clause))
+        return literal
+
+    def _value(self, literal):
+        value = self.values.get(abs(literal))
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def _add_clause(self, clause):
+        """Adds a clause at decision level 0."""
+        if self.inconsistent:
+            return
+
+        # Facts at level 0 are permanent, so drop literals they decide
+        if any(self._value(literal) is True for literal in clause):
+            return
+        clause = [literal for literal in clause if self._value(literal) is None]
+
+        if not clause:
+            self.inconsistent = True
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            if self._propagate() is not None:
+                self.inconsistent = True
+        else:
+            self.clauses.append(clause)
+            self._watch(clause)
+
+    def _watch(self, clause):
+        for literal in clause[:2]:
+            self.watches.setdefault(literal, []).append(clause)
+
+    def _assign(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """
+        Applies unit propagation to the trail, returning a conflicting
+        clause or None.
+        """
+        while self.propagated < len(self.trail):
+            false_literal = -self.trail[self.propagated]
+            self.propagated += 1
+
+            watching = self.watches.get(false_literal, [])
+            self.watches[false_literal] = kept = []
+            for i, clause in enumerate(watching):
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                if self._value(clause[0]) is True:
+                    kept.append(clause)
+                    continue
+
+                # Look for another literal to watch instead
+                for k in range(2, len(clause)):
+                    if self._value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self._value(clause[0]) is False:
+                        kept.extend(watching[i + 1 :])
+                        return clause
+                    self._assign(clause[0], clause)
+        return None
+
+    def _analyze(self, conflict):
+        """
+        Derives a learned clause from a conflict at the first unique
+        implication point, returning it with the level to backjump to.
+        """
+        level = len(self.trail_limits)
+        learned = [None]
+        seen = set()
+        pending = 0
+        index = len(self.trail) - 1
+        clause = conflict
+        literal = None
+
+        while True:
+            for other in clause if literal is None else clause[1:]:
+                variable = abs(other)
+                if variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self._bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Resolve on the most recently assigned literal in the conflict
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+
+        learned[0] = -literal
+        if len(learned) == 1:
+            return learned, 0
+
+        # Watch the literal assigned at the highest remaining level second
+        highest = max(
+            range(1, len(learned)), key=lambda i: self.levels[abs(learned[i])]
+        )
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def _bump(self, variable):
+        self.activity[variable] = self.activity.get(variable, 0.0) + self.increment
+        heapq.heappush(self.queue, (-self.activity[variable], variable))
+        self._compact_queue()
+
+    def _backtrack(self, level):
+        if len(self.trail_limits) <= level:
+            return
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            variable = abs(literal)
+            del self.values[variable]
+            heapq.heappush(self.queue, (-self.activity.get(variable, 0.0), variable))
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.propagated = min(self.propagated, limit)
+        self._compact_queue()
+
+    def _compact_queue(self):
+        """
+        Rebuilds the decision queue from the unassigned variables
+        once stale entries make up most of it
+        """
+        if len(self.queue) <= 2 * self.queued + 16:
+            return
+        self.queue = [
+            (-self.activity.get(variable, 0.0), variable)
+            for variable in range(1, self.queued + 1)
+            if variable not in self.values
+        ]
+        heapq.heapify(self.queue)
+
+    def _decide(self):
+        """Returns the most active unassigned variable, or None if all are."""
+        while self.queue:
+            _, variable = heapq.heappop(self.queue)
+            if variable not in self.values:
+                return variable
+        return None
+
+    def _solve(self, assumptions):
+        """Checks satisfiability with `assumptions` as the first decisions."""
+        if self.inconsistent:
+            return False
+
+        for variable in range(self.queued + 1, len(self.clausifier.names)):
+            if variable not in self.values:
+                heapq.heappush(
+                    self.queue, (-self.activity.get(variable, 0.0), variable)
+                )
+        self.queued = len(self.clausifier.names) - 1
+
+        try:
+            while True:
+                conflict = self._propagate()
+                if conflict is not None:
+                    if not self.trail_limits:
+                        self.inconsistent = True
+                        return False
+                    learned, level = self._analyze(conflict)
+                    self._backtrack(level)
+                    if len(learned) > 1:
+                        self.learned.append(learned)
+                        self._watch(learned)
+                    self._assign(learned[0], learned if len(learned) > 1 else None)
+                    self.increment *= 1.05
+                    continue
+
+                level = len(self.trail_limits)
+                if level < len(assumptions):
+                    literal = assumptions[level]
+                    value = self._value(literal)
+                    if value is False:
+                        return False
+                    self.trail_limits.append(len(self.trail))
+                    if value is None:
+                        self._assign(literal, None)
+                    continue
+
+                variable = self._decide()
+                if variable is None:
+                    return True
+                self.trail_limits.append(len(self.trail))
+                self._assign(-variable, None)
+        finally:
+            self._backtrack(0)
@@ -0,0 +1,108 @@
+import random
+import time
+
+from cs50_assignments.knowledge.minesweeper.minesweeper import (
+    Minesweeper,
+    MinesweeperAI,
+)
+from cs50_assignments.knowledge.minesweeper.simulate import play
+
+BOARDS = [(16, 30), (32, 60), (64, 120)]
+DENSITY = 0.1
+GAMES = 3
+
+
+def main():
+    print("Subset/superset lookup per sentence (index / full scan)")
+    for height, width in BOARDS:
+        indexed, scanned = lookup_times(height, width)
+        print(f"  {height}x{width}: {indexed * 1e6:.1f}us / {scanned * 1e6:.1f}us")
+
+    print("Inference time per move")
+    for height, width in BOARDS:
+        mines = round(height * width * DENSITY)
+        results = [play(height, width, mines, seed) for seed in range(GAMES)]
+        moves = sum(result["moves"] for result in results)
+        inference_time = sum(result["inference_time"] for result in results)
+        print(f"  {height}x{width}: {inference_time / moves * 1000:.3f}ms")
+
+    print("Deduction rate and inference time per move (pairwise / linear)")
+    for height, width in BOARDS:
+        pairwise = solver_performance(height, width, "pairwise")
+        linear = solver_performance(height, width, "linear")
+        print(
+            f"  {height}x{width}: {pairwise[0]:.1%} / {linear[0]:.1%}, "
+            f"{pairwise[1] * 1000:.3f}ms / {linear[1] * 1000:.3f}ms"
+        )
+
+
+def solver_performance(height, width, solver):
+    """
+    Plays seeded games with the given inference engine, returning the
+    share of moves that were deduced rather than guessed and the
+    average inference time per move.
+    """
+    mines = round(height * width * DENSITY)
+    results = [play(height, width, mines, seed, solver=solver) for seed in range(GAMES)]
+    moves = sum(result["moves"] for result in results)
+    guesses = sum(result["guesses"] for result in results)
+    inference_time = sum(result["inference_time"] for result in results)
+    return 1 - guesses / moves, inference_time / moves
+
+
+def lookup_times(height, width):
+    """
+    Plays seeded games, timing after each move how long finding the
+    supersets and subsets of every sentence in the knowledge base takes
+    through the knowledge base, which only scans all its sentences while
+    there are few of them, and with a scan of all of them. Returns the
+    average time per sentence of both.
+    """
+    mines = round(height * width * DENSITY)
+    indexed = scanned = 0
+    lookups = 0
+    for seed in range(GAMES):
+        random.seed(seed)
+        game = Minesweeper(height=height, width=width, mines=mines)
+        ai = MinesweeperAI(height=height, width=width, mines=mines)
+        while True:
+            move = ai.make_safe_move()
+            if move is None:
+                move = ai.make_random_move()
+            if move is None or game.is_mine(move):
+                break
+            ai.add_knowledge(move, game.nearby_mines(move))
+
+            sentences = list(ai.knowledge)
+            start = time.perf_counter()
+            for sentence in sentences:
+                ai.knowledge.supersets_and_subsets(sentence)
+            indexed += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for sentence in sentences:
+                scan_supersets_and_subsets(sentence, sentences)
+            scanned += time.perf_counter() - start
+            lookups += len(sentences)
+    return indexed / lookups, scanned / lookups
+
+
+def scan_supersets_and_subsets(sentence, sentences):
+    """
+    Returns the sentences among `sentences` whose cells are a proper
+    superset of the cells of sentence and those whose cells are a
+    proper subset of them, comparing sentence with each of them.
+    """
+    cells = sentence.cells
+    supersets = []
+    subsets = []
+    for other in sentences:
+        if cells < other.cells:
+            supersets.append(other)
+        elif other.cells < cells:
+            subsets.append(other)
+    return supersets, subsets
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import itertools
+import json
+import math
 import random
+import time
 
 
 class Minesweeper:
@@ -95,9 +99,33 @@ class Sentence:
     def __eq__(self, other):
         return self.cells == other.cells and self.count == other.count
 
+    def __len__(self):
+        return len(self.cells)
+
     def __str__(self):
         return f"{self.cells} = {self.count}"
 
+    def key(self):
+        """
+        Returns a hashable snapshot of the sentence, equal for
+        sentences that are equal.
+        """
+        return (frozenset(self.cells), self.count)
+
+    def is_proper_subset(self, other):
+        """
+        Checks if the cells of this sentence are a
+        proper subset of the cells of `other`.
+        """
+        return self.cells < other.cells
+
+    def difference(self, other):
+        """
+        Returns the sentence about the cells of this sentence
+        that are not in `other`, whose cells must be a subset.
+        """
+        return Sentence(self.cells - other.cells, self.count - other.count)
+
     def known_mines(self):
         """
         Returns the set of all cells in self.cells known to be mines.
@@ -150,25 +178,324 @@ class Sentence:
         self.cells.remove(cell)
 
 
+class KnowledgeBase:
+    """
+    Collection of sentences about a Minesweeper game,
+    indexed by the cells they contain.
+
+    Equal sentences are only stored once and sentences
+    left without any cells are dropped.
+    """
+
+    # Up to this many sentences, scanning them all finds supersets and
+    # subsets faster than going through the index
+    SCAN_LIMIT = 24
+
+    def __init__(self):
+        # Sentences by their key, in the order they were added
+        self.sentences = dict()
+
+        # Ids of the sentences containing each cell
+        self.index = dict()
+
+        # Sentences added or changed that inference has not looked at yet
+        self.pending = dict()
+
+    def __contains__(self, sentence):
+        return sentence.key() in self.sentences
+
+    def __iter__(self):
+        return iter(list(self.sentences.values()))
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def add(self, sentence):
+        """
+        Adds a sentence, returning it if it was
+        new knowledge and None otherwise.
+        """
+        key = sentence.key()
+        if not sentence.cells or key in self.sentences:
+            return None
+
+        self.sentences[key] = sentence
+        self.pending[id(sentence)] = sentence
+        for cell in sentence.cells:
+            self.index.setdefault(cell, dict())[id(sentence)] = sentence
+        return sentence
+
+    append = add
+
+    def pop_pending(self):
+        """
+        Removes and returns a sentence that was added or changed
+        since it was last popped, or None if there is none.
+        """
+        if not self.pending:
+            return None
+        return self.pending.popitem()[1]
+
+    def containing(self, cell):
+        """
+        Returns the sentences that contain cell.
+        """
+        return list(self.index.get(cell, dict()).values())
+
+    def supersets_and_subsets(self, sentence):
+        """
+        Returns the sentences whose cells are a proper superset of the
+        cells of sentence and those whose cells are a proper subset of
+        them, among the sentences sharing a cell with it.
+        """
+        cells = sentence.cells
+        if len(self.sentences) <= self.SCAN_LIMIT:
+            candidates = self.sentences.values()
+        else:
+            overlapping = dict()
+            for cell in cells:
+                overlapping.update(self.index.get(cell, dict()))
+            candidates = overlapping.values()
+
+        supersets = []
+        subsets = []
+        for other in candidates:
+            if cells < other.cells:
+                supersets.append(other)
+            elif other.cells < cells:
+                subsets.append(other)
+        return supersets, subsets
+
+    def mark_mine(self, cell):
+        """
+        Marks cell as a mine in the sentences containing it,
+        returning the sentences that were changed and kept.
+        """
+        return self._update(cell, lambda sentence: sentence.mark_mine(cell))
+
+    def mark_safe(self, cell):
+        """
+        Marks cell as safe in the sentences containing it,
+        returning the sentences that were changed and kept.
+        """
+        return self._update(cell, lambda sentence: sentence.mark_safe(cell))
+
+    def _update(self, cell, mark):
+        changed = []
+        for sentence in self.index.pop(cell, dict()).values():
+            del self.sentences[sentence.key()]
+            mark(sentence)
+
+            key = sentence.key()
+            if sentence.cells and key not in self.sentences:
+                self.sentences[key] = sentence
+                self.pending[id(sentence)] = sentence
+                changed.append(sentence)
+                continue
+
+            # Sentence is now empty or a duplicate of another one
+            self.pending.pop(id(sentence), None)
+            for other_cell in sentence.cells:
+                del self.index[other_cell][id(sentence)]
+        return changed
+
+
+class TrackedSet(set):
+    """
+    Set that calls `on_add` with every element added to it and
+    `on_remove` with every element removed from it, however it is
+    changed in place.
+    """
+
+    def __init__(self, elements=(), on_add=None, on_remove=None):
+        super().__init__(elements)
+        self.on_add = on_add
+        self.on_remove = on_remove
+
+    def add(self, element):
+        if element not in self:
+            set.add(self, element)
+            if self.on_add is not None:
+                self.on_add(element)
+
+    def discard(self, element):
+        if element in self:
+            set.discard(self, element)
+            if self.on_remove is not None:
+                self.on_remove(element)
+
+    def remove(self, element):
+        if element not in self:
+            raise KeyError(element)
+        self.discard(element)
+
+    def pop(self):
+        element = next(iter(self))
+        self.discard(element)
+        return element
+
+    def clear(self):
+        for element in list(self):
+            self.discard(element)
+
+    def update(self, *others):
+        for other in others:
+            for element in other:
+                self.add(element)
+
+    def difference_update(self, *others):
+        for other in others:
+            for element in other:
+                self.discard(element)
+
+    def intersection_update(self, *others):
+        kept = set(self).intersection(*others)
+        for element in list(self):
+            if element not in kept:
+                self.discard(element)
+
+    def symmetric_difference_update(self, other):
+        for element in set(other):
+            if element in self:
+                self.discard(element)
+            else:
+                self.add(element)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+
 class MinesweeperAI:
     """
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    # Largest frontier component whose mine configurations are enumerated
+    MAX_COMPONENT_CELLS = 24
+
+    # Most partial assignments tried when enumerating a component's
+    # mine configurations before falling back to local densities
+    MAX_ENUMERATION_NODES = 50000
+
+    # Mine density assumed for unconstrained cells when the mine total is unknown
+    DEFAULT_MINE_DENSITY = 0.125
+
+    # Inference engines add_knowledge can use
+    SOLVERS = ("pairwise", "linear")
+
+    def __init__(
+        self,
+        height=8,
+        width=8,
+        mines=None,
+        best_guess=True,
+        solver="pairwise",
+        trace=False,
+    ):
+        if solver not in self.SOLVERS:
+            raise ValueError(f"unknown solver {solver!r}")
+
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Total number of mines on the board, if known
+        self.total_mines = mines
+
+        # Whether random moves pick the cell least likely to be a mine
+        self.best_guess = best_guess
+
+        # Whether inference compares sentences pairwise or solves
+        # them as a system of linear equations
+        self.solver = solver
+
+        # Statistics of every add_knowledge call, if tracing
+        self.trace = [] if trace else None
+        self.trace_start = time.perf_counter()
+
+        # Mine probabilities of frontier components, by their sentences
+        self.component_cache = dict()
+
         # Keep track of which cells have been clicked on
-        self.moves_made = set()
+        self._moves_made = TrackedSet(
+            on_add=self._unsafe_move, on_remove=self._safe_move
+        )
 
         # Keep track of cells known to be safe or mines
         self.mines = set()
-        self.safes = set()
+        self._safes = TrackedSet(on_add=self._safe_move, on_remove=self._unsafe_move)
+        self._reset_safe_moves()
+
+        # Cells in no sentence that are not known to be mines or safe,
+        # as a stack from which cells that stopped qualifying are only
+        # dropped once they reach the top
+        self.unconstrained_cells = sorted(
+            itertools.product(range(height), range(width)), reverse=True
+        )
+
+        # Sentences about the game known to be true
+        self.knowledge = KnowledgeBase()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+    @property
+    def moves_made(self):
+        return self._moves_made
+
+    @moves_made.setter
+    def moves_made(self, moves_made):
+        self._moves_made = TrackedSet(
+            moves_made, on_add=self._unsafe_move, on_remove=self._safe_move
+        )
+        self._reset_safe_moves()
+
+    @property
+    def safes(self):
+        return self._safes
+
+    @safes.setter
+    def safes(self, safes):
+        self._safes = TrackedSet(
+            safes, on_add=self._safe_move, on_remove=self._unsafe_move
+        )
+        self._reset_safe_moves()
+
+    def _reset_safe_moves(self):
+        """
+        Recomputes the safe cells not yet played once
+        self.safes or self.moves_made is replaced
+        """
+        # Safe cells that have not been played, and a stack of them
+        # from which cells played since are only dropped on reaching
+        # the top
+        self.safe_unplayed = self.safes - self.moves_made
+        self.safe_moves = list(self.safe_unplayed)
+
+    def _safe_move(self, cell):
+        """
+        Tracks a cell that became safe or stopped being played
+        """
+        if cell in self._safes and cell not in self._moves_made:
+            if cell not in self.safe_unplayed:
+                self.safe_unplayed.add(cell)
+                self.safe_moves.append(cell)
+
+    def _unsafe_move(self, cell):
+        """
+        Tracks a cell that was played or stopped being known safe
+        """
+        self.safe_unplayed.discard(cell)
 
     def mark_mine(self, cell):
         """
@@ -176,17 +503,15 @@ class MinesweeperAI:
         to mark that cell as a mine as well.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.knowledge.mark_mine(cell)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self._safes.add(cell)
+        self.knowledge.mark_safe(cell)
 
     def add_knowledge(self, cell, count):
         """
@@ -203,27 +528,118 @@ class MinesweeperAI:
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
         """
-        # valdidate
+        self.add_knowledge_many([(cell, count)])
 
-        self.moves_made.add(cell)
-        self.mark_safe(cell)
+    def add_knowledge_many(self, observations):
+        """
+        Adds the knowledge from many `(cell, count)` observations at
+        once, such as every cell revealed by opening a region with no
+        nearby mines, running inference a single time afterwards.
 
-        neighboring_cells = self._get_neighboring_cells(cell)
-        neighboring_cells_without_known_mines = neighboring_cells - self.mines
-        count -= len(neighboring_cells) - len(neighboring_cells_without_known_mines)
-        neighboring_cells_without_known_mines_and_safes = (
-            neighboring_cells_without_known_mines - self.safes
+        If tracing, the knowledge base size, inference statistics and
+        time spent in each phase are appended to the trace.
+        """
+        tracing = self.trace is not None
+        if tracing:
+            stats = {
+                "iterations": 0,
+                "comparisons": 0,
+                "eliminations": 0,
+                "inferred": [],
+            }
+            knowledge_before = len(self.knowledge)
+            start = time.perf_counter()
+
+        observations = list(observations)
+        for cell, _ in observations:
+            self._moves_made.add(cell)
+            self.mark_safe(cell)
+        if tracing:
+            marked = time.perf_counter()
+
+        for cell, count in observations:
+            self._observe(cell, count)
+        if tracing:
+            observed = time.perf_counter()
+
+        self._infer(stats if tracing else None)
+        if not tracing:
+            return
+
+        inferred = time.perf_counter()
+        self.trace.append(
+            {
+                "move": len(self.trace),
+                "start": start - self.trace_start,
+                "observations": len(observations),
+                "knowledge_before": knowledge_before,
+                "knowledge": len(self.knowledge),
+                "mines": len(self.mines),
+                "safes": len(self.safes),
+                **stats,
+                "time": {
+                    "mark": marked - start,
+                    "observe": observed - marked,
+                    "infer": inferred - observed,
+                },
+            }
         )
-        sentence = Sentence(neighboring_cells_without_known_mines_and_safes, count)
-        self.knowledge.append(sentence)
 
-        keep_recursing = True
+    def write_trace(self, path, chrome=False):
+        """
+        Writes the statistics traced for every add_knowledge call to
+        `path` as JSON, or with `chrome` as a trace event file that
+        chrome://tracing and Perfetto can open.
+        """
+        if self.trace is None:
+            raise Exception("tracing is not enabled")
 
-        while keep_recursing:
-            keep_recursing = (
-                self._recursively_update_known_mines_and_safes()
-                or self._recursively_infer_new_sentences_from_knowledge()
+        if not chrome:
+            with open(path, "w") as f:
+                json.dump(self.trace, f, indent=2)
+            return
+
+        events = []
+        for record in self.trace:
+            start = record["start"] * 1e6
+            events.append(
+                {
+                    "name": "add_knowledge",
+                    "ph": "X",
+                    "ts": start,
+                    "dur": sum(record["time"].values()) * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": {
+                        key: value
+                        for key, value in record.items()
+                        if key not in ("start", "time")
+                    },
+                }
+            )
+            for phase, duration in record["time"].items():
+                events.append(
+                    {
+                        "name": phase,
+                        "ph": "X",
+                        "ts": start,
+                        "dur": duration * 1e6,
+                        "pid": 0,
+                        "tid": 0,
+                    }
+                )
+                start += duration * 1e6
+            events.append(
+                {
+                    "name": "knowledge",
+                    "ph": "C",
+                    "ts": start,
+                    "pid": 0,
+                    "args": {"sentences": record["knowledge"]},
+                }
             )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events}, f)
 
     def make_safe_move(self):
         """
@@ -233,13 +649,19 @@ class MinesweeperAI:
 
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
+
+        The safe cells not yet played are kept up to date as
+        self.safes and self.moves_made change, so this takes
+        constant amortized time.
         """
-        safe_moves = self.safes - self.moves_made
+        safe_moves = self.safe_moves
+        while safe_moves and safe_moves[-1] not in self.safe_unplayed:
+            safe_moves.pop()
 
         if len(safe_moves) == 0:
             return None
 
-        return next(iter(safe_moves))  # arbitrary safe move
+        return safe_moves[-1]  # arbitrary safe move
 
     def make_random_move(self):
         """
@@ -247,14 +669,211 @@ class MinesweeperAI:
         Should choose randomly among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+
+        With `best_guess` the cell least likely to be a mine is chosen.
+        As cells in no sentence are all equally likely to be mines, only
+        one of them is considered. Finding it takes time proportional to
+        the number of sentences, as every component of the frontier is
+        looked up, though the probabilities of a component are only
+        enumerated again once its sentences change.
+
+        Without `best_guess`, a move takes constant amortized time while
+        any cell is in no sentence, and otherwise time proportional to
+        the number of cells in sentences.
         """
-        grid_set = {(i, j) for i in range(self.height) for j in range(self.width)}
-        random_moves = (grid_set - self.moves_made) - self.mines
+        safe_move = self.make_safe_move()
+        if safe_move is not None:
+            return safe_move
+
+        unconstrained = self._unconstrained_cell()
+        if unconstrained is not None and not self.best_guess:
+            return unconstrained  # arbitrary move
+
+        random_moves = [
+            cell
+            for cell, sentences in self.knowledge.index.items()
+            if sentences and cell not in self.moves_made and cell not in self.mines
+        ]
+        if unconstrained is not None:
+            random_moves.append(unconstrained)
 
         if len(random_moves) == 0:
             return None
 
-        return next(iter(random_moves))  # arbitrary safe move
+        if not self.best_guess:
+            return random_moves[0]  # arbitrary move
+
+        probabilities = self.mine_probabilities(random_moves)
+        return min(random_moves, key=lambda cell: (probabilities[cell], cell))
+
+    def mine_probabilities(self, cells):
+        """
+        Returns the probability that each of `cells` is a mine.
+
+        The sentences in the knowledge base are split into independent
+        components of cells linked by shared sentences, and the mine
+        configurations consistent with each component are enumerated.
+        Cells in no sentence share the mines not expected elsewhere.
+        """
+        probabilities = dict()
+        expected_mines = 0
+        for sentences in self._frontier_components():
+            component = self._component_probabilities(sentences)
+            probabilities.update(component)
+            expected_mines += sum(component.values())
+
+        unconstrained = [
+            cell
+            for cell in cells
+            if cell not in probabilities and cell not in self.safes
+        ]
+        if self.total_mines is None:
+            density = self.DEFAULT_MINE_DENSITY
+        else:
+            # Moves made are all marked safe
+            unknown = self.height * self.width - len(self.safes)
+            unknown -= len(self.mines) + len(probabilities)
+            remaining = self.total_mines - len(self.mines) - expected_mines
+            density = min(max(remaining / unknown, 0), 1) if unknown > 0 else 0
+
+        result = dict.fromkeys(unconstrained, density)
+        for cell in cells:
+            if cell in self.safes:
+                result[cell] = 0
+            elif cell in probabilities:
+                result[cell] = probabilities[cell]
+        return result
+
+    def _unconstrained_cell(self):
+        """
+        Returns the first cell in no sentence that is not known
+        to be a mine or safe, or None if there are none left
+        """
+        cells = self.unconstrained_cells
+        while cells:
+            cell = cells[-1]
+            if (
+                cell in self.moves_made
+                or cell in self.mines
+                or cell in self.safes
+                or self.knowledge.index.get(cell)
+            ):
+                cells.pop()
+                continue
+            return cell
+        return None
+
+    def _frontier_components(self, sentences=None):
+        """
+        Groups the sentences in the knowledge base into
+        components connected by shared cells, only those
+        containing one of `sentences` if given
+        """
+        components = []
+        visited = set()
+        for sentence in self.knowledge if sentences is None else sentences:
+            if id(sentence) in visited:
+                continue
+
+            visited.add(id(sentence))
+            component = [sentence]
+            frontier = [sentence]
+            while frontier:
+                for other in self._overlapping_sentences(frontier.pop()):
+                    if id(other) not in visited:
+                        visited.add(id(other))
+                        component.append(other)
+                        frontier.append(other)
+            components.append(component)
+        return components
+
+    def _component_probabilities(self, sentences):
+        """
+        Returns the mine probability of each cell in a component,
+        enumerating the mine configurations consistent with its sentences
+        """
+        key = frozenset(sentence.key() for sentence in sentences)
+        if key in self.component_cache:
+            return self.component_cache[key]
+
+        constraints = [(list(sentence.cells), sentence.count) for sentence in sentences]
+        cells = list(dict.fromkeys(cell for cells, _ in constraints for cell in cells))
+
+        probabilities = None
+        if len(cells) <= self.MAX_COMPONENT_CELLS:
+            probabilities = self._enumerate_configurations(cells, constraints)
+        if probabilities is None:
+            # Too large to enumerate in budget, or inconsistent:
+            # use local densities
+            probabilities = dict()
+            for sentence_cells, count in constraints:
+                for cell in sentence_cells:
+                    density = count / len(sentence_cells)
+                    probabilities[cell] = max(probabilities.get(cell, 0), density)
+
+        if len(self.component_cache) > 10000:
+            self.component_cache.clear()
+        self.component_cache[key] = probabilities
+        return probabilities
+
+    def _enumerate_configurations(self, cells, constraints):
+        """
+        Counts, over all mine assignments to cells consistent with the
+        constraints, how often each cell is a mine. Returns the resulting
+        probabilities, or None if no assignment is consistent or more
+        than MAX_ENUMERATION_NODES partial assignments would be tried.
+        """
+        position = {cell: index for index, cell in enumerate(cells)}
+        constraints_of = [[] for _ in cells]
+        needed = []
+        free = []
+        for index, (constraint_cells, count) in enumerate(constraints):
+            for cell in constraint_cells:
+                constraints_of[position[cell]].append(index)
+            needed.append(count)
+            free.append(len(constraint_cells))
+
+        assignment = [False] * len(cells)
+        mine_counts = [0] * len(cells)
+        solutions = 0
+        nodes = 0
+
+        def assign(index):
+            nonlocal solutions, nodes
+            nodes += 1
+            if nodes > self.MAX_ENUMERATION_NODES:
+                return
+
+            if index == len(cells):
+                solutions += 1
+                for i, is_mine in enumerate(assignment):
+                    if is_mine:
+                        mine_counts[i] += 1
+                return
+
+            for is_mine in (False, True):
+                consistent = True
+                for constraint in constraints_of[index]:
+                    free[constraint] -= 1
+                    if is_mine:
+                        needed[constraint] -= 1
+                    if needed[constraint] < 0 or needed[constraint] > free[constraint]:
+                        consistent = False
+
+                if consistent:
+                    assignment[index] = is_mine
+                    assign(index + 1)
+
+                for constraint in constraints_of[index]:
+                    free[constraint] += 1
+                    if is_mine:
+                        needed[constraint] += 1
+            assignment[index] = False
+
+        assign(0)
+        if solutions == 0 or nodes > self.MAX_ENUMERATION_NODES:
+            return None
+        return {cell: mine_counts[position[cell]] / solutions for cell in cells}
 
     def _get_neighboring_cells(self, cell):
         """
@@ -262,79 +881,207 @@ class MinesweeperAI:
         who's state is not yet determined
         """
         cells = set()
+        moves_made = self._moves_made
 
         for i in range(max(cell[0] - 1, 0), min(cell[0] + 2, self.height)):
             for j in range(max(cell[1] - 1, 0), min(cell[1] + 2, self.width)):
                 neighbor_cell = (i, j)
-                if neighbor_cell not in self.moves_made and neighbor_cell != cell:
+                if neighbor_cell not in moves_made and neighbor_cell != cell:
                     cells.add(neighbor_cell)
 
         return cells
 
-    def _recursively_update_known_mines_and_safes(self):
+    def _infer(self, stats=None):
         """
-        Recursively goes through knowledge and marks
-        safes and mines accordingly
+        Draws conclusions from the sentences added or changed since the
+        last inference, comparing each of them only with the sentences
+        whose cells are a subset or superset of its own, until no new
+        knowledge is found.
+
+        With the linear solver, the changed sentences are also
+        solved together with their components once the sentences
+        that are trivially all mines or all safe are used up.
+
+        If given, `stats` counts the sentences taken from the worklist
+        as iterations, the subset and superset comparisons and the
+        eliminations made, and lists the knowledge inferred by each.
         """
-        found_new_information = False
+        changed = []
         while True:
-            infered_safes = set()
-            infered_mines = set()
-            for sentence in self.knowledge:
-                infered_safes.update(sentence.known_safes() - self.safes)
-                infered_mines.update(sentence.known_mines() - self.mines)
-
-            if len(infered_safes) == 0 and len(infered_mines) == 0:
-                return found_new_information
-
-            found_new_information = True
-
-            for inferred_safe in infered_safes:
-                self.mark_safe(inferred_safe)
-
-            for inferred_mine in infered_mines:
-                self.mark_mine(inferred_mine)
+            sentence = self.knowledge.pop_pending()
+            if sentence is None:
+                changed = [
+                    sentence for sentence in changed if sentence in self.knowledge
+                ]
+                if not changed:
+                    return
+                known = len(self.mines) + len(self.safes)
+                self._eliminate(changed)
+                changed = []
+                if stats is not None:
+                    stats["eliminations"] += 1
+                    stats["inferred"].append(len(self.mines) + len(self.safes) - known)
+                continue
+
+            if stats is not None:
+                stats["iterations"] += 1
+
+            mines = list(sentence.known_mines())
+            safes = list(sentence.known_safes())
+            if mines or safes:
+                for mine in mines:
+                    self.mark_mine(mine)
+                for safe in safes:
+                    self.mark_safe(safe)
+                if stats is not None:
+                    stats["inferred"].append(len(mines) + len(safes))
+                continue
+
+            if self.solver == "linear":
+                changed.append(sentence)
+
+            supersets, subsets = self.knowledge.supersets_and_subsets(sentence)
+            inferred = 0
+            for superset in supersets:
+                inferred += (
+                    self.knowledge.add(superset.difference(sentence)) is not None
+                )
+            for subset in subsets:
+                inferred += self.knowledge.add(sentence.difference(subset)) is not None
+
+            if stats is not None:
+                stats["comparisons"] += len(supersets) + len(subsets)
+                stats["inferred"].append(inferred)
+
+    def _eliminate(self, sentences):
+        """
+        Treats each component containing one of `sentences` as a
+        system of linear equations, one per sentence, over whether
+        its cells are mines, reduces it by Gaussian elimination and
+        marks the cells that any equation met along the way forces
+        """
+        mines = set()
+        safes = set()
+
+        def force(coefficients, constant):
+            forced_mines, forced_safes = _forced_cells(coefficients, constant)
+            mines.update(forced_mines)
+            safes.update(forced_safes)
+
+        for component in self._frontier_components(sentences):
+            rows = [
+                (dict.fromkeys(sentence.cells, 1), sentence.count)
+                for sentence in component
+            ]
+            _row_reduce(rows, visit=force)
+
+        for mine in mines:
+            self.mark_mine(mine)
+        for safe in safes:
+            self.mark_safe(safe)
+
+    def _observe(self, cell, count):
+        """
+        Adds the sentence about the neighbors of `cell` that are not yet
+        known to be mines or safe.
+        """
+        neighboring_cells = self._get_neighboring_cells(cell)
+        neighboring_cells_without_known_mines = neighboring_cells - self.mines
+        count -= len(neighboring_cells) - len(neighboring_cells_without_known_mines)
+        neighboring_cells_without_known_mines_and_safes = (
+            neighboring_cells_without_known_mines - self.safes
+        )
+        sentence = Sentence(neighboring_cells_without_known_mines_and_safes, count)
+        self.knowledge.add(sentence)
 
-    def _recursively_infer_new_sentences_from_knowledge(self):
+    def _overlapping_sentences(self, sentence):
         """
-        Recursively goes through knowledge and
-        generates new knowledge
+        Returns the other sentences sharing at least one cell with sentence
         """
-        found_new_information = False
+        overlapping = dict()
+        for cell in sentence.cells:
+            for other in self.knowledge.containing(cell):
+                overlapping[id(other)] = other
+        overlapping.pop(id(sentence), None)
+        return list(overlapping.values())
 
-        while True:
-            infered_sentences = []
-            for sentence1 in self.knowledge:
-                for sentence2 in self.knowledge:
-                    if sentence1 == sentence2:
-                        continue
-
-                    inferred_sentence = self._infer_new_sentences_from_two_sentences(
-                        sentence1, sentence2
-                    )
-                    if inferred_sentence is not None:
-                        infered_sentences.append(inferred_sentence)
-                        continue
-
-                    inferred_sentence = self._infer_new_sentences_from_two_sentences(
-                        sentence2, sentence1
-                    )
-                    if inferred_sentence is not None:
-                        infered_sentences.append(inferred_sentence)
-                        continue
-
-            if len(infered_sentences) == 0:
-                return found_new_information
-
-            found_new_information = True
-            for inferred_sentence in infered_sentences:
-                self.knowledge.append(inferred_sentence)
-
-    def _infer_new_sentences_from_two_sentences(self, sentence1, sentence2):
-        if sentence1.cells.issubset(sentence2.cells):
-            inferred_sentence = Sentence(
-                sentence2.cells - sentence1.cells, sentence2.count - sentence1.count
-            )
-            if inferred_sentence not in self.knowledge:
-                return inferred_sentence
-        return None
+
+def _row_reduce(rows, visit=None):
+    """
+    Brings a system of linear equations, given as `(coefficients,
+    constant)` rows with coefficients by variable, to reduced row
+    echelon form using integer row operations. Returns the nonzero rows.
+
+    If given, `visit` is called with every row, given or produced
+    along the way, as some rows imply more than the reduced system.
+    """
+    reduced = []
+    for coefficients, constant in rows:
+        if visit is not None:
+            visit(coefficients, constant)
+        for pivot, pivot_coefficients, pivot_constant in reduced:
+            if pivot in coefficients:
+                coefficients, constant = _eliminate_variable(
+                    coefficients, constant, pivot_coefficients, pivot_constant, pivot
+                )
+                if visit is not None:
+                    visit(coefficients, constant)
+        if not coefficients:
+            continue
+
+        pivot = min(coefficients)
+        for index, (other_pivot, other_coefficients, other_constant) in enumerate(
+            reduced
+        ):
+            if pivot in other_coefficients:
+                other_coefficients, other_constant = _eliminate_variable(
+                    other_coefficients, other_constant, coefficients, constant, pivot
+                )
+                if visit is not None:
+                    visit(other_coefficients, other_constant)
+                reduced[index] = (other_pivot, other_coefficients, other_constant)
+        reduced.append((pivot, coefficients, constant))
+    return [(coefficients, constant) for _, coefficients, constant in reduced]
+
+
+def _eliminate_variable(coefficients, constant, other, other_constant, variable):
+    """
+    Subtracts a multiple of the `other` row from a row so that `variable`
+    drops out of it, dividing the result by the gcd of its numbers
+    """
+    scale, other_scale = other[variable], coefficients[variable]
+    result = {
+        key: value * scale for key, value in coefficients.items() if key != variable
+    }
+    for key, value in other.items():
+        if key != variable:
+            result[key] = result.get(key, 0) - value * other_scale
+    result = {key: value for key, value in result.items() if value}
+    constant = constant * scale - other_constant * other_scale
+
+    divisor = math.gcd(constant, *result.values())
+    if divisor > 1:
+        result = {key: value // divisor for key, value in result.items()}
+        constant //= divisor
+    return result, constant
+
+
+def _forced_cells(coefficients, constant):
+    """
+    Returns the cells that must be mines and those that must be safe
+    for a linear equation over 0/1 variables to hold
+    """
+    lowest = sum(value for value in coefficients.values() if value < 0)
+    highest = sum(value for value in coefficients.values() if value > 0)
+    mines = []
+    safes = []
+    if not lowest <= constant <= highest:
+        return mines, safes
+
+    for cell, value in coefficients.items():
+        # Too large a term to leave out, or to include
+        if abs(value) > highest - constant:
+            (mines if value > 0 else safes).append(cell)
+        elif abs(value) > constant - lowest:
+            (safes if value > 0 else mines).append(cell)
+    return mines, safes
@@ -0,0 +1,197 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from cs50_assignments.knowledge.minesweeper.minesweeper import (
+    Minesweeper,
+    MinesweeperAI,
+)
+from cs50_assignments.knowledge.minesweeper.vectorized import VectorizedMinesweeper
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play seeded Minesweeper games headlessly with the AI."
+    )
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--density", type=float, default=0.125)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="reveal whole regions with no nearby mines in one move",
+    )
+    parser.add_argument("--solver", choices=MinesweeperAI.SOLVERS, default="pairwise")
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write the AI's inference trace of the first game as JSON",
+    )
+    parser.add_argument(
+        "--chrome",
+        action="store_true",
+        help="write the trace as a chrome://tracing event file",
+    )
+    args = parser.parse_args()
+
+    summary = simulate(
+        args.games,
+        height=args.height,
+        width=args.width,
+        density=args.density,
+        processes=args.processes,
+        seed=args.seed,
+        cascade=args.cascade,
+        solver=args.solver,
+    )
+    print(
+        f"{summary['games']} games on {args.height}x{args.width} "
+        f"with {summary['mines']} mines"
+    )
+    print(f"  Win rate: {summary['win_rate']:.1%}")
+    print(f"  Deduction rate: {summary['deduction_rate']:.1%}")
+    print(f"  Moves per second: {summary['moves_per_second']:.0f}")
+    print(
+        "  Inference time per move: "
+        f"{summary['inference_time_per_move'] * 1000:.3f}ms"
+    )
+
+    if args.trace:
+        play(
+            args.height,
+            args.width,
+            summary["mines"],
+            args.seed,
+            cascade=args.cascade,
+            solver=args.solver,
+            trace=args.trace,
+            chrome=args.chrome,
+        )
+
+
+def simulate(
+    games,
+    height=8,
+    width=8,
+    density=0.125,
+    processes=None,
+    seed=0,
+    cascade=False,
+    solver="pairwise",
+):
+    """
+    Plays `games` games of Minesweeper, game `i` seeded with `seed + i`,
+    across a pool of `processes` worker processes (all CPUs by default,
+    in this process if 1). If `cascade` is true, revealing a cell with no
+    nearby mines reveals its whole region, as in the desktop game.
+    `solver` picks the AI's inference engine.
+
+    Returns a dictionary summarising the win rate, share of moves that
+    were deduced rather than guessed, moves per second and inference
+    time per move, along with the results of every game.
+    """
+    mines = round(height * width * density)
+    seeds = range(seed, seed + games)
+    play_seed = partial(play, height, width, mines, cascade=cascade, solver=solver)
+
+    if processes == 1:
+        results = [play_seed(game_seed) for game_seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(play_seed, seeds))
+
+    moves = sum(result["moves"] for result in results)
+    game_time = sum(result["time"] for result in results)
+    inference_time = sum(result["inference_time"] for result in results)
+    guesses = sum(result["guesses"] for result in results)
+    return {
+        "games": games,
+        "mines": mines,
+        "win_rate": sum(result["won"] for result in results) / games,
+        "deduction_rate": 1 - guesses / moves if moves else 0,
+        "moves_per_second": moves / game_time if game_time else 0,
+        "inference_time_per_move": inference_time / moves if moves else 0,
+        "results": results,
+    }
+
+
+def play(
+    height,
+    width,
+    mines,
+    seed,
+    cascade=False,
+    solver="pairwise",
+    trace=None,
+    chrome=False,
+):
+    """
+    Plays a single game seeded with `seed`, returning whether the AI
+    won, how many moves it made and how many of them were guesses, and
+    how long the game and the AI's inference took. If `trace` is a
+    path, the AI's inference trace is written to it.
+    """
+    random.seed(seed)
+    if cascade:
+        game = VectorizedMinesweeper(height=height, width=width, mines=mines, seed=seed)
+    else:
+        game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(
+        height=height,
+        width=width,
+        mines=mines,
+        solver=solver,
+        trace=trace is not None,
+    )
+
+    revealed = set()
+    moves = 0
+    guesses = 0
+    inference_time = 0
+    won = False
+    start = time.perf_counter()
+
+    while True:
+        move = ai.make_safe_move()
+        guessed = move is None
+        if guessed:
+            move = ai.make_random_move()
+        if move is None or game.is_mine(move):
+            break
+
+        moves += 1
+        guesses += guessed
+        if cascade:
+            observations = game.reveal(move)
+        else:
+            observations = [(move, game.nearby_mines(move))]
+        revealed.update(cell for cell, _ in observations)
+
+        inference_start = time.perf_counter()
+        ai.add_knowledge_many(observations)
+        inference_time += time.perf_counter() - inference_start
+
+        if len(revealed) == height * width - mines:
+            won = True
+            break
+
+    if trace is not None:
+        ai.write_trace(trace, chrome=chrome)
+
+    return {
+        "seed": seed,
+        "won": won,
+        "moves": moves,
+        "guesses": guesses,
+        "time": time.perf_counter() - start,
+        "inference_time": inference_time,
+    }
+
+
+if __name__ == "__main__":
+    main()
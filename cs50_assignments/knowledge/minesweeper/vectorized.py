@@ -0,0 +1,123 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+import numpy as np
+
+from cs50_assignments.knowledge.minesweeper.minesweeper import Minesweeper
+
+
+class VectorizedMinesweeper(Minesweeper):
+    """
+    Minesweeper game backed by NumPy arrays, for large simulated boards.
+
+    Mines are placed in one draw, the number of nearby mines of every
+    cell is computed once with a 3x3 convolution, and a zero cell's
+    whole region is revealed in one call, by a breadth-first search
+    over the horizontal runs of cells without nearby mines.
+    """
+
+    def __init__(self, height=8, width=8, mines=8, seed=None):
+        self.height = height
+        self.width = width
+
+        rng = np.random.default_rng(seed)
+        self.board = np.zeros((height, width), dtype=bool)
+        self.board.flat[rng.choice(height * width, size=mines, replace=False)] = True
+        self.mines = set(zip(*map(np.ndarray.tolist, np.nonzero(self.board))))
+
+        # Number of mines around each cell, not counting the cell itself
+        self.counts = _neighborhood_sum(self.board.astype(np.int8)) - self.board
+
+        self.revealed = np.zeros((height, width), dtype=bool)
+
+        # Runs of cells without nearby mines: run k covers columns
+        # starts[k] to ends[k] - 1 of row rows[k], and the runs of row i
+        # are row_runs[i] to row_runs[i + 1] - 1, from left to right
+        empty = np.pad((self.counts == 0) & ~self.board, ((0, 0), (1, 1)))
+        changes = np.diff(empty.astype(np.int8), axis=1)
+        rows, starts = np.nonzero(changes == 1)
+        self.run_rows = rows.tolist()
+        self.run_starts = starts.tolist()
+        self.run_ends = np.nonzero(changes == -1)[1].tolist()
+        self.row_runs = np.searchsorted(rows, np.arange(height + 1)).tolist()
+
+        # At first, player has found no mines
+        self.mines_found = set()
+
+    def is_mine(self, cell):
+        return bool(self.board[cell])
+
+    def nearby_mines(self, cell):
+        """
+        Returns the number of mines that are
+        within one row and column of a given cell,
+        not including the cell itself.
+        """
+        return int(self.counts[cell])
+
+    def reveal(self, cell):
+        """
+        Reveals a safe cell, and if no mines are nearby, every cell
+        connected to it through cells with no nearby mines together with
+        their neighbors. Returns a list of `(cell, count)` pairs for the
+        cells that were not revealed before.
+        """
+        if self.board[cell]:
+            raise ValueError(f"cell {cell} is a mine")
+
+        region = np.zeros_like(self.board)
+        region[cell] = True
+        if self.counts[cell] == 0:
+            for k in self._connected_runs(cell):
+                i, start, end = self.run_rows[k], self.run_starts[k], self.run_ends[k]
+                region[max(i - 1, 0) : i + 2, max(start - 1, 0) : end + 1] = True
+            region &= ~self.board
+
+        new = region & ~self.revealed
+        self.revealed |= new
+        rows, columns = np.nonzero(new)
+        counts = self.counts[rows, columns]
+        return [
+            ((i, j), count)
+            for i, j, count in zip(rows.tolist(), columns.tolist(), counts.tolist())
+        ]
+
+    def _connected_runs(self, cell):
+        """
+        Returns the runs of cells without nearby mines that are connected
+        to a cell without nearby mines, including its own run.
+        """
+        i, j = cell
+        first = bisect_right(self.run_starts, j, self.row_runs[i], self.row_runs[i + 1])
+        found = {first - 1}
+        queue = deque(found)
+        while queue:
+            k = queue.popleft()
+            i, start, end = self.run_rows[k], self.run_starts[k], self.run_ends[k]
+            for row in (i - 1, i + 1):
+                if not 0 <= row < self.height:
+                    continue
+
+                # Runs of the row touching this one, diagonals included
+                last = self.row_runs[row + 1]
+                k = bisect_left(self.run_ends, start, self.row_runs[row], last)
+                while k < last and self.run_starts[k] <= end:
+                    if k not in found:
+                        found.add(k)
+                        queue.append(k)
+                    k += 1
+        return found
+
+
+def _neighborhood_sum(array):
+    """
+    Returns the sum of each cell's 3x3 neighborhood, including the cell,
+    treating cells outside the board as zero.
+    """
+    height, width = array.shape
+    padded = np.pad(array.astype(np.int16), 1)
+    total = np.zeros((height, width), dtype=np.int16)
+    for di in range(3):
+        for dj in range(3):
+            total += padded[di : di + height, dj : dj + width]
+    return total
@@ -0,0 +1,102 @@
+import random
+import time
+
+from cs50_assignments.uncertainty.pagerank.graph import LinkGraph
+from cs50_assignments.uncertainty.pagerank.pagerank import (
+    DAMPING,
+    iterate_pagerank,
+    iterate_pagerank_sparse,
+    sample_pagerank,
+    sample_pagerank_vectorized,
+)
+
+SIZES = [100, 1000, 100000]
+LINKS = 10
+SAMPLES = 10000
+
+# Samples taken by the vectorized sampler on the largest corpus
+MANY_SAMPLES = 10**7
+
+# Change below which iterate_pagerank is taken to have converged
+CONVERGED = 1e-8
+
+# Largest corpus iterate_pagerank is timed on
+MAX_DICT_PAGES = 1000
+
+
+def main():
+    print("Iteration time (dict / sparse)")
+    for size in SIZES:
+        corpus = random_corpus(size)
+        graph = LinkGraph.from_corpus(corpus)
+        sparse = timed(iterate_pagerank_sparse, graph, DAMPING)
+        if size <= MAX_DICT_PAGES:
+            dict_time = f"{timed(iterate_pagerank, corpus, DAMPING) * 1000:.1f}ms"
+        else:
+            dict_time = "-"
+        print(f"  {size} pages: {dict_time} / {sparse * 1000:.1f}ms")
+
+    print(f"Sampling time for {SAMPLES} samples (dict / vectorized)")
+    for size in SIZES:
+        corpus = random_corpus(size)
+        graph = LinkGraph.from_corpus(corpus)
+        vectorized = timed(sample_pagerank_vectorized, graph, DAMPING, SAMPLES)
+        if size <= MAX_DICT_PAGES:
+            dict_time = f"{timed(sample_pagerank, corpus, DAMPING, SAMPLES):.2f}s"
+        else:
+            dict_time = "-"
+        print(f"  {size} pages: {dict_time} / {vectorized:.2f}s")
+
+    print(f"Updates to converge to an L1 change of {CONVERGED} (dict iteration)")
+    corpus = random_corpus(MAX_DICT_PAGES)
+    for name, options in [
+        ("Jacobi", {}),
+        ("Gauss-Seidel", {"gauss_seidel": True}),
+        ("Jacobi with Aitken", {"aitken": True}),
+        ("Gauss-Seidel with Aitken", {"gauss_seidel": True, "aitken": True}),
+    ]:
+        log = []
+        iterate_pagerank(
+            corpus,
+            DAMPING,
+            tolerance=CONVERGED,
+            norm="l1",
+            log=lambda *entry: log.append(entry),
+            **options,
+        )
+        print(f"  {name}: {len(log)}")
+
+    graph = LinkGraph.from_corpus(random_corpus(SIZES[-1]))
+    for walkers in (100, 1000):
+        vectorized = timed(
+            sample_pagerank_vectorized, graph, DAMPING, MANY_SAMPLES, walkers
+        )
+        print(
+            f"{MANY_SAMPLES} samples on {SIZES[-1]} pages "
+            f"with {walkers} walkers: {vectorized:.2f}s"
+        )
+
+
+def random_corpus(size, seed=0):
+    """
+    Returns a corpus of `size` pages, each linking to up to
+    `LINKS` other pages chosen at random.
+    """
+    rng = random.Random(seed)
+    pages = [f"{i}.html" for i in range(size)]
+    return {
+        page: set(rng.sample(pages, rng.randint(0, LINKS))) - {page} for page in pages
+    }
+
+
+def timed(function, *args):
+    """
+    Returns how long calling `function` with `args` takes.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
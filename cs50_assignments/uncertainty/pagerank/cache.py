@@ -0,0 +1,109 @@
+import hashlib
+import os
+import zipfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from cs50_assignments.uncertainty.pagerank.crawler import build_graph, read_pages
+
+# Directory link graphs are cached in by default
+CACHE_DIRECTORY = Path.home() / ".cache" / "cs50-pagerank"
+
+
+def load_graph(directory, cache_directory=CACHE_DIRECTORY, processes=1):
+    """
+    Returns the `LinkGraph` of a directory of HTML pages, parsing only
+    the pages added or changed since it was last loaded.
+
+    The links found in every page are cached in a compressed NumPy file
+    per directory, along with each page's modification time and size.
+    Pages whose modification time or size differ from the cache are
+    parsed again, in a pool of `processes` worker processes.
+    """
+    directory = Path(directory).resolve()
+    cache_path = cache_path_of(directory, cache_directory)
+
+    pages = dict()
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".html") and entry.is_file():
+            stat = entry.stat()
+            pages[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+    cached = read_cache(cache_path, directory)
+    links = {
+        page: cached[page][1]
+        for page, stamp in pages.items()
+        if page in cached and cached[page][0] == stamp
+    }
+
+    changed = [page for page in pages if page not in links]
+    paths = [directory / page for page in changed]
+    links.update(zip(changed, read_pages(paths, processes)))
+
+    if changed or len(cached) != len(pages):
+        write_cache(cache_path, directory, pages, links)
+
+    return build_graph(list(pages), (links[page] for page in pages))
+
+
+def cache_path_of(directory, cache_directory=CACHE_DIRECTORY):
+    """
+    Returns the path of the cache file of a directory.
+    """
+    key = hashlib.sha256(str(directory).encode()).hexdigest()[:16]
+    return Path(cache_directory) / f"{key}.npz"
+
+
+def read_cache(path, directory):
+    """
+    Returns the cached modification time and size, and links,
+    of each page, or an empty dictionary if there is no usable
+    cache of the directory at `path`.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if str(data["directory"]) != str(directory):
+                return dict()
+            pages = data["pages"].tolist()
+            stamps = zip(data["mtimes"].tolist(), data["sizes"].tolist())
+            names = data["names"].tolist()
+            indptr = data["indptr"].tolist()
+            indices = data["indices"].tolist()
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile, zlib.error):
+        return dict()
+
+    return {
+        page: (stamp, {names[i] for i in indices[indptr[n] : indptr[n + 1]]})
+        for n, (page, stamp) in enumerate(zip(pages, stamps))
+    }
+
+
+def write_cache(path, directory, pages, links):
+    """
+    Writes the modification time and size, and links, of each page
+    to the cache file at `path`.
+    """
+    names = sorted(set().union(*links.values()))
+    ids = {name: i for i, name in enumerate(names)}
+    indptr = [0]
+    indices = []
+    for page in pages:
+        indices.extend(ids[link] for link in links[page])
+        indptr.append(len(indices))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    with open(temporary, "wb") as f:
+        np.savez_compressed(
+            f,
+            directory=np.array(str(directory)),
+            pages=np.array(list(pages), dtype=str),
+            mtimes=np.array([mtime for mtime, _ in pages.values()], dtype=np.int64),
+            sizes=np.array([size for _, size in pages.values()], dtype=np.int64),
+            names=np.array(names, dtype=str),
+            indptr=np.array(indptr, dtype=np.int64),
+            indices=np.array(indices, dtype=np.int64),
+        )
+    os.replace(temporary, path)
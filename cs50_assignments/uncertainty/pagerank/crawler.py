@@ -0,0 +1,83 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from cs50_assignments.uncertainty.pagerank.graph import LinkGraph
+
+LINK = re.compile(rb"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+
+# Bytes read from an HTML file at a time
+CHUNK_SIZE = 1 << 16
+
+# Longest unfinished tag carried over to the next chunk
+MAX_TAG_SIZE = 1 << 16
+
+
+def crawl_graph(directory, processes=None, chunk_size=CHUNK_SIZE):
+    """
+    Parses a directory of HTML pages into a `LinkGraph` of the links
+    between them, reading the pages in a pool of `processes` worker
+    processes (all CPUs by default, in this process if 1).
+    """
+    filenames = [
+        entry.name
+        for entry in os.scandir(directory)
+        if entry.name.endswith(".html") and entry.is_file()
+    ]
+    paths = [os.path.join(directory, filename) for filename in filenames]
+    return build_graph(filenames, read_pages(paths, processes, chunk_size))
+
+
+def read_pages(paths, processes=None, chunk_size=CHUNK_SIZE):
+    """
+    Returns the set of links in each of the HTML files at `paths`,
+    reading them in a pool of `processes` worker processes (all CPUs
+    by default, in this process if 1).
+    """
+    read = partial(read_links, chunk_size=chunk_size)
+    if processes == 1 or len(paths) <= 1:
+        return [read(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(read, paths, chunksize=max(len(paths) // 256, 1)))
+
+
+def build_graph(pages, links):
+    """
+    Builds a `LinkGraph` from page names and an iterable of the set of
+    links in each page, keeping only links to other pages in `pages`.
+    """
+    ids = {page: i for i, page in enumerate(pages)}
+    indptr = [0]
+    indices = []
+    for i, page_links in enumerate(links):
+        page_ids = {ids[link] for link in page_links if link in ids}
+        page_ids.discard(i)
+        indices.extend(sorted(page_ids))
+        indptr.append(len(indices))
+    return LinkGraph(pages, indptr, indices)
+
+
+def read_links(path, chunk_size=CHUNK_SIZE):
+    """
+    Returns the set of pages linked to by the HTML file at `path`,
+    reading it `chunk_size` bytes at a time.
+    """
+    links = set()
+    tail = b""
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            text = tail + chunk
+            end = 0
+            for match in LINK.finditer(text):
+                links.add(match.group(1))
+                end = match.end()
+
+            # Keep any tag the chunk ended in the middle of,
+            # unless it is too long to be a link
+            start = text.rfind(b"<", end)
+            tail = text[start:] if start != -1 else b""
+            if len(tail) > MAX_TAG_SIZE:
+                tail = b""
+    return {link.decode(errors="replace") for link in links}
@@ -0,0 +1,155 @@
+import numpy as np
+
+
+class LinkGraph:
+    """
+    Links between the pages of a corpus, stored as a compressed sparse
+    row adjacency matrix over integer page ids.
+
+    The links of page `i` are `indices[indptr[i]:indptr[i + 1]]`.
+    """
+
+    def __init__(self, pages, indptr, indices):
+        # Page names, by id
+        self.pages = list(pages)
+
+        # Ids of the pages, by name
+        self.ids = {page: i for i, page in enumerate(self.pages)}
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+
+        # Number of links out of each page, and the page each link is from
+        self.out_degree = np.diff(self.indptr)
+        self.sources = np.repeat(np.arange(len(self.pages)), self.out_degree)
+
+        # Pages without links to other pages
+        self.dangling = self.out_degree == 0
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """
+        Builds the graph of a corpus dictionary mapping each page
+        to the set of pages it links to.
+        """
+        pages = list(corpus)
+        ids = {page: i for i, page in enumerate(pages)}
+        indptr = [0]
+        indices = []
+        for page in pages:
+            indices.extend(sorted(ids[link] for link in corpus[page]))
+            indptr.append(len(indices))
+        return cls(pages, indptr, indices)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def links(self, i):
+        """
+        Returns the ids of the pages page `i` links to.
+        """
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def to_corpus(self):
+        """
+        Returns the corpus dictionary mapping each page
+        to the set of pages it links to.
+        """
+        return {
+            page: {self.pages[link] for link in self.links(i).tolist()}
+            for i, page in enumerate(self.pages)
+        }
+
+    def to_dict(self, values):
+        """
+        Returns a dictionary mapping each page name to its value in `values`.
+        """
+        return dict(zip(self.pages, np.asarray(values).tolist()))
+
+    def propagate(self, ranks):
+        """
+        Returns how much rank each page receives through links when every
+        page shares its rank equally between the pages it links to.
+        Pages without links pass on nothing.
+        """
+        shares = np.divide(
+            ranks,
+            self.out_degree,
+            out=np.zeros(len(self.pages)),
+            where=~self.dangling,
+        )
+        return np.bincount(
+            self.indices, weights=shares[self.sources], minlength=len(self.pages)
+        )
+
+    def step(self, positions, damping_factor, rng):
+        """
+        Moves random surfers at pages `positions` one step each: with
+        probability `damping_factor` to a link of their page chosen
+        uniformly at random, and otherwise, or if their page has no
+        links, to a page chosen uniformly at random.
+        """
+        degrees = self.out_degree[positions]
+        follow = (rng.random(len(positions)) < damping_factor) & (degrees > 0)
+        next_positions = rng.integers(len(self.pages), size=len(positions))
+        offsets = (rng.random(np.count_nonzero(follow)) * degrees[follow]).astype(
+            np.int64
+        )
+        next_positions[follow] = self.indices[self.indptr[positions[follow]] + offsets]
+        return next_positions
+
+    def sample(self, damping_factor, samples, walkers=100, rng=None):
+        """
+        Returns how many of `samples` samples visited each page, taken
+        by `walkers` random surfers that start at random pages and move
+        together, one step at a time. `rng` is a NumPy Generator or a
+        seed for one.
+        """
+        rng = np.random.default_rng(rng)
+        positions = rng.integers(len(self.pages), size=min(walkers, samples))
+        counts, _ = self.walk(damping_factor, samples, positions, rng)
+        return counts
+
+    def walk(self, damping_factor, samples, positions, rng):
+        """
+        Takes `samples` samples with random surfers starting at pages
+        `positions`, counting their current pages before every step.
+        Returns how many samples visited each page and the pages the
+        surfers would visit next.
+        """
+        counts = np.zeros(len(self.pages), dtype=np.int64)
+
+        # Visits are counted in batches, as counting is O(pages)
+        visits = []
+        batched = 0
+        taken = 0
+        while taken < samples:
+            visited = positions[: samples - taken]
+            visits.append(visited)
+            batched += len(visited)
+            taken += len(visited)
+            positions = self.step(positions, damping_factor, rng)
+            if taken == samples or batched >= len(self.pages):
+                counts += np.bincount(np.concatenate(visits), minlength=len(counts))
+                visits = []
+                batched = 0
+        return counts, positions
+
+    def power_iteration(self, damping_factor, tolerance=0.001):
+        """
+        Returns the PageRank of every page as an array, repeating the
+        PageRank update until no page's rank changes by `tolerance` or
+        more. Pages without links are treated as linking to every page,
+        by spreading their rank over all pages.
+        """
+        n = len(self.pages)
+        ranks = np.full(n, 1 / n)
+        while True:
+            dangling_rank = ranks[self.dangling].sum()
+            new_ranks = (1 - damping_factor) / n + damping_factor * (
+                self.propagate(ranks) + dangling_rank / n
+            )
+            converged = np.abs(new_ranks - ranks).max() < tolerance
+            ranks = new_ranks
+            if converged:
+                return ranks
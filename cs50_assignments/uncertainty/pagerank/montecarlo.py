@@ -0,0 +1,116 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from statistics import NormalDist
+
+import numpy as np
+
+from cs50_assignments.uncertainty.pagerank.graph import LinkGraph
+
+# Graph the walkers of a worker process sample from
+_graph = None
+
+
+def estimate_pagerank(
+    corpus,
+    damping_factor,
+    samples,
+    walkers=4,
+    surfers=100,
+    rounds=10,
+    processes=None,
+    seed=0,
+    target_error=None,
+    confidence=0.95,
+):
+    """
+    Estimates PageRank by sampling with `walkers` independent groups of
+    `surfers` random surfers, run across a pool of `processes` worker
+    processes (all CPUs by default, in this process if 1). `corpus` may
+    be a corpus dictionary or an already built `LinkGraph`.
+
+    Each walker gets its own seed spawned from `seed`, so results do
+    not depend on the number of processes. The samples are taken in
+    `rounds` rounds, and the counts of each walker in each round are
+    treated as one batch when estimating `confidence` intervals. If
+    `target_error` is given, sampling stops after the first round in
+    which no interval reaches further than that from its estimate.
+
+    Returns a dictionary with the estimated ranks and confidence
+    intervals by page, the number of samples taken and the largest
+    half-width of any interval.
+    """
+    graph = corpus if isinstance(corpus, LinkGraph) else LinkGraph.from_corpus(corpus)
+    batch = max(samples // (walkers * rounds), 1)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    states = [
+        (np.random.default_rng(walker_seed), None)
+        for walker_seed in np.random.SeedSequence(seed).spawn(walkers)
+    ]
+
+    executor = None
+    walk = partial(_walk, graph)
+    if processes != 1:
+        executor = ProcessPoolExecutor(
+            max_workers=processes, initializer=_set_graph, initargs=(graph,)
+        )
+        walk = partial(_walk, None)
+
+    batches = []
+    try:
+        for _ in range(rounds):
+            tasks = [(damping_factor, batch, surfers, state) for state in states]
+            if executor is None:
+                results = [walk(task) for task in tasks]
+            else:
+                results = list(executor.map(walk, tasks))
+            batches.extend(counts for counts, _ in results)
+            states = [state for _, state in results]
+
+            ranks, errors = _batch_means(batches, batch, z)
+            if target_error is not None and errors.max() <= target_error:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    lows = np.maximum(ranks - errors, 0).tolist()
+    highs = np.minimum(ranks + errors, 1).tolist()
+    return {
+        "ranks": graph.to_dict(ranks),
+        "intervals": dict(zip(graph.pages, zip(lows, highs))),
+        "samples": batch * len(batches),
+        "error": float(errors.max()),
+    }
+
+
+def _set_graph(graph):
+    global _graph
+    _graph = graph
+
+
+def _walk(graph, task):
+    """
+    Continues a walker's surfers for a batch of samples, returning the
+    batch's counts and the walker's random generator and positions.
+    Uses the worker process's graph if `graph` is None.
+    """
+    damping_factor, batch, surfers, (rng, positions) = task
+    graph = _graph if graph is None else graph
+    if positions is None:
+        positions = rng.integers(len(graph), size=min(surfers, batch))
+    counts, positions = graph.walk(damping_factor, batch, positions, rng)
+    return counts, (rng, positions)
+
+
+def _batch_means(batches, batch, z):
+    """
+    Returns the mean share of samples of every page across batches of
+    `batch` samples, and the half-width of the confidence interval
+    around each mean for the normal quantile `z`
+    """
+    shares = np.array(batches) / batch
+    means = shares.mean(axis=0)
+    if len(batches) < 2:
+        return means, np.ones_like(means)
+    errors = z * shares.std(axis=0, ddof=1) / np.sqrt(len(batches))
+    return means, errors
@@ -1,11 +1,20 @@
-import os
 import random
-import re
 import sys
 from pathlib import Path
 
+from cs50_assignments.uncertainty.pagerank.cache import load_graph
+from cs50_assignments.uncertainty.pagerank.crawler import crawl_graph
+from cs50_assignments.uncertainty.pagerank.graph import LinkGraph
+
 DAMPING = 0.85
 SAMPLES = 10000
+TOLERANCE = 0.001
+
+# Ways iterate_pagerank can measure the change between two estimates
+NORMS = ("max", "l1")
+
+# Updates between extrapolations in iterate_pagerank
+AITKEN_INTERVAL = 10
 
 
 def main():
@@ -13,7 +22,7 @@ def main():
         sys.exit("Usage: python pagerank.py corpus")
 
     dir = Path(__file__).parent / sys.argv[1]
-    corpus = crawl(dir)
+    corpus = load_graph(dir).to_corpus()
     ranks = sample_pagerank(corpus, DAMPING, SAMPLES)
     print(f"PageRank Results from Sampling (n = {SAMPLES})")
     for page in sorted(ranks):
@@ -30,22 +39,7 @@ def crawl(directory):
     Return a dictionary where each key is a page, and values are
     a list of all other pages in the corpus that are linked to by the page.
     """
-    pages = dict()
-
-    # Extract all links from HTML files
-    for filename in os.listdir(directory):
-        if not filename.endswith(".html"):
-            continue
-        with open(os.path.join(directory, filename)) as f:
-            contents = f.read()
-            links = re.findall(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"", contents)
-            pages[filename] = set(links) - {filename}
-
-    # Only include links to other pages in the corpus
-    for filename in pages:
-        pages[filename] = set(link for link in pages[filename] if link in pages)
-
-    return pages
+    return crawl_graph(directory, processes=1).to_corpus()
 
 
 def transition_model(corpus, page, damping_factor):
@@ -99,52 +93,150 @@ def sample_pagerank(corpus, damping_factor, n):
     return {key: value / n for key, value in estimated_rank.items()}
 
 
-def iterate_pagerank(corpus, damping_factor):
+def sample_pagerank_vectorized(corpus, damping_factor, n, walkers=100, seed=None):
+    """
+    Return PageRank values for each page like `sample_pagerank`, but
+    with `walkers` random surfers moving together as NumPy arrays over
+    a `LinkGraph`, seeded with `seed`. `corpus` may be a corpus
+    dictionary or an already built `LinkGraph`.
+
+    Return a dictionary where keys are page names, and values are
+    their estimated PageRank value (a value between 0 and 1). All
+    PageRank values should sum to 1.
+    """
+    graph = corpus if isinstance(corpus, LinkGraph) else LinkGraph.from_corpus(corpus)
+    return graph.to_dict(graph.sample(damping_factor, n, walkers, seed) / n)
+
+
+def iterate_pagerank(
+    corpus,
+    damping_factor,
+    tolerance=TOLERANCE,
+    norm="max",
+    gauss_seidel=False,
+    aitken=False,
+    log=None,
+):
     """
     Return PageRank values for each page by iteratively updating
     PageRank values until convergence.
 
+    Iteration stops once an update changes the estimates by less than
+    `tolerance`, measured by `norm`: "max" for the largest change of any
+    page, or "l1" for the sum of the changes of all pages. With
+    `gauss_seidel`, each page's new rank is used by the pages after it
+    in the same update. With `aitken`, every `AITKEN_INTERVAL` updates
+    the estimates are extrapolated from the last three with Aitken's
+    delta-squared process. If given, `log` is called after every update
+    with the update's number and change.
+
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
+    if norm not in NORMS:
+        raise ValueError(f"unknown norm {norm!r}")
 
-    # make correction if there is a page with no links
-    # we need to make page link to all pages including itself
+    # pages with no links are treated as linking to every page, including
+    # themselves, so their rank is spread evenly over the whole corpus
+    dangling_pages = [page for page, links in corpus.items() if len(links) == 0]
+    incoming_links = {page: [] for page in corpus}
     for linking_page, linking_page_pages in corpus.items():
-        if len(linking_page_pages) == 0:
-            corpus[linking_page] = corpus.keys()
+        for linked_page in linking_page_pages:
+            incoming_links[linked_page].append(linking_page)
 
-    tolerance = 0.001
     n = len(corpus)
     p_of_random_selection = (1 - damping_factor) / n
     estimated_distibution = dict.fromkeys(corpus.keys(), 1 / len(corpus))
-    tolerance_condition_satisfied = False
-    while tolerance_condition_satisfied is False:
-        new_estimated_distibution = {}
-        tolerance_condition_satisfied = True
+    recent_distributions = [estimated_distibution]
+    iteration = 0
+    while True:
+        iteration += 1
+        dangling_rank = sum(estimated_distibution[page] for page in dangling_pages)
+
+        # Gauss-Seidel updates read the ranks as they are being updated
+        if gauss_seidel:
+            new_estimated_distibution = dict(estimated_distibution)
+            linking_distribution = new_estimated_distibution
+        else:
+            new_estimated_distibution = {}
+            linking_distribution = estimated_distibution
+
         for key in estimated_distibution:
             sum_of_pages_that_link = 0
-            for linking_page, linking_page_pages in corpus.items():
-                if key in linking_page_pages:
-                    sum_of_pages_that_link += estimated_distibution[linking_page] / len(
-                        linking_page_pages
-                    )
-
-            new_rank_estimate = (
-                p_of_random_selection + damping_factor * sum_of_pages_that_link
-            )
-            value_change_within_tolerance = (
-                abs(new_rank_estimate - estimated_distibution[key]) < tolerance
-            )
-            tolerance_condition_satisfied = (
-                tolerance_condition_satisfied and value_change_within_tolerance
+            for linking_page in incoming_links[key]:
+                sum_of_pages_that_link += linking_distribution[linking_page] / len(
+                    corpus[linking_page]
+                )
+
+            new_rank_estimate = p_of_random_selection + damping_factor * (
+                sum_of_pages_that_link + dangling_rank / n
             )
+            if gauss_seidel and len(corpus[key]) == 0:
+                dangling_rank += new_rank_estimate - linking_distribution[key]
             new_estimated_distibution[key] = new_rank_estimate
 
+        changes = [
+            abs(new_estimated_distibution[key] - estimated_distibution[key])
+            for key in estimated_distibution
+        ]
+        change = max(changes) if norm == "max" else sum(changes)
+        if log is not None:
+            log(iteration, change)
+
         estimated_distibution = new_estimated_distibution
+        if change < tolerance:
+            return _normalize(estimated_distibution)
+
+        recent_distributions = recent_distributions[-2:] + [estimated_distibution]
+        if aitken and iteration % AITKEN_INTERVAL == 0:
+            estimated_distibution = _aitken_extrapolate(*recent_distributions)
+            recent_distributions = [estimated_distibution]
+
+
+def _aitken_extrapolate(first, second, third):
+    """
+    Returns the limit of three successive estimates extrapolated with
+    Aitken's delta-squared process, taking the ratio between successive
+    changes as the same for every page. The latest estimate is returned
+    if the changes are not shrinking.
+    """
+    first_changes = [second[key] - first[key] for key in third]
+    second_changes = [third[key] - second[key] for key in third]
+    ratio = sum(a * b for a, b in zip(first_changes, second_changes)) / max(
+        sum(a * a for a in first_changes), sys.float_info.min
+    )
+    if not 0 < ratio < 1:
+        return third
+
+    factor = ratio / (1 - ratio)
+    extrapolated = {
+        key: max(third[key] + factor * change, 0)
+        for key, change in zip(third, second_changes)
+    }
+    return _normalize(extrapolated)
+
+
+def _normalize(distribution):
+    """
+    Returns the distribution scaled to sum to 1.
+    """
+    total = sum(distribution.values())
+    return {key: value / total for key, value in distribution.items()}
+
+
+def iterate_pagerank_sparse(corpus, damping_factor, tolerance=TOLERANCE):
+    """
+    Return PageRank values for each page like `iterate_pagerank`, running
+    the iteration as sparse matrix-vector products over a `LinkGraph`.
+    `corpus` may be a corpus dictionary or an already built `LinkGraph`.
 
-    return estimated_distibution
+    Return a dictionary where keys are page names, and values are
+    their estimated PageRank value (a value between 0 and 1). All
+    PageRank values should sum to 1.
+    """
+    graph = corpus if isinstance(corpus, LinkGraph) else LinkGraph.from_corpus(corpus)
+    return graph.to_dict(graph.power_iteration(damping_factor, tolerance))
 
 
 if __name__ == "__main__":
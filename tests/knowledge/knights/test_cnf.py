@@ -0,0 +1,62 @@
+import itertools
+
+import pytest
+
+from cs50_assignments.knowledge.knights.cnf import Clausifier, normalize
+from cs50_assignments.knowledge.knights.logic import (
+    FALSE,
+    TRUE,
+    And,
+    Biconditional,
+    Implication,
+    Not,
+    Or,
+    Symbol,
+)
+
+A, B, C = Symbol("A"), Symbol("B"), Symbol("C")
+
+
+def satisfiable(clauses, assignment, variables):
+    """Brute forces whether clauses hold in some extension of assignment."""
+    free = [variable for variable in range(1, variables) if variable not in assignment]
+    for values in itertools.product((True, False), repeat=len(free)):
+        model = {**assignment, **dict(zip(free, values))}
+        if all(
+            any(model[abs(literal)] == (literal > 0) for literal in clause)
+            for clause in clauses
+        ):
+            return True
+    return False
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        Or(A, Not(B)),
+        And(Or(A, B), Not(C)),
+        Implication(And(A, B), Or(C, Not(A))),
+        Biconditional(A, And(B, Or(C, Not(A)))),
+        Not(Biconditional(Or(A, B), C)),
+    ],
+)
+def test_clauses_are_equisatisfiable_in_every_model(sentence):
+    clausifier = Clausifier()
+    clauses = clausifier.clauses(sentence)
+    names = [symbol.name for symbol in (A, B, C)]
+    for values in itertools.product((True, False), repeat=len(names)):
+        model = dict(zip(names, values))
+        assignment = {clausifier.variable(name): value for name, value in model.items()}
+        expected = sentence.evaluate(model)
+        assert satisfiable(clauses, assignment, len(clausifier.names)) == expected
+
+
+def test_constant_clauses():
+    clausifier = Clausifier()
+    assert clausifier.clauses(TRUE) == []
+    assert clausifier.clauses(FALSE) == [()]
+
+
+def test_normalize():
+    assert normalize([1, -2, 1]) == (1, -2)
+    assert normalize([1, -1]) is None
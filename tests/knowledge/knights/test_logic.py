@@ -0,0 +1,217 @@
+import copy
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from cs50_assignments.knowledge.knights import logic
+from cs50_assignments.knowledge.knights.logic import (
+    FALSE,
+    TRUE,
+    And,
+    Biconditional,
+    Implication,
+    Not,
+    Or,
+    Symbol,
+    model_check,
+    model_check_all,
+    simplify,
+)
+
+A, B, C = Symbol("A"), Symbol("B"), Symbol("C")
+
+
+def test_structurally_identical_sentences_are_shared():
+    first = And(Or(Symbol("A"), Not(Symbol("B"))), Symbol("C"))
+    second = And(Or(Symbol("A"), Not(Symbol("B"))), Symbol("C"))
+    assert first is second
+    assert first == second
+    assert hash(first) == hash(second)
+
+
+def test_different_sentences_are_not_equal():
+    assert And(A, B) != Or(A, B)
+    assert Implication(A, B) != Implication(B, A)
+
+
+def test_symbols_are_cached():
+    sentence = Biconditional(A, And(B, Not(C)))
+    assert sentence.symbols() == {"A", "B", "C"}
+    assert sentence.symbols() is sentence.symbols()
+
+
+def test_formula_is_cached():
+    sentence = And(A, Not(B))
+    assert sentence.formula() == "A ∧ ¬B"
+    assert sentence.formula() is sentence.formula()
+
+
+def test_sentences_are_immutable():
+    sentence = And(A, B)
+    with pytest.raises(AttributeError):
+        sentence.conjuncts = ()
+    with pytest.raises(AttributeError):
+        A.name = "B"
+
+
+def test_add_raises_as_conjunctions_are_immutable():
+    sentence = And(A)
+    with pytest.raises(TypeError, match="conjuncts"):
+        sentence.add(B)
+    assert sentence.conjuncts == (A,)
+
+
+def test_symbols_of_deep_sentences():
+    sentence = Symbol("A0")
+    for i in range(1, 3000):
+        sentence = And(sentence, Symbol(f"A{i}"))
+    assert sentence.symbols() == {f"A{i}" for i in range(3000)}
+    assert sentence.conjuncts[0].symbols() == {f"A{i}" for i in range(2999)}
+
+
+def test_validate_rejects_non_sentences():
+    with pytest.raises(TypeError):
+        And(A, "B")
+
+
+def test_copy_and_pickle_preserve_sharing():
+    sentence = Or(Not(A), Implication(B, C))
+    assert copy.deepcopy(sentence) is sentence
+    assert pickle.loads(pickle.dumps(sentence)) is sentence
+
+
+def test_model_check():
+    knowledge = And(Or(A, B), Not(B))
+    assert model_check(knowledge, A)
+    assert not model_check(knowledge, B)
+
+
+def test_model_check_all_classifies_queries():
+    knowledge = And(Or(A, B), Not(B), Or(C, Not(C)))
+    results = model_check_all(knowledge, [A, B, C, Or(A, C)])
+    assert results == {A: True, B: False, C: None, Or(A, C): True}
+
+
+def test_model_check_all_matches_model_check():
+    knowledge = And(Implication(A, B), Biconditional(B, C), A)
+    queries = [A, B, C, Not(C), Or(Not(A), C)]
+    results = model_check_all(knowledge, queries)
+    for query in queries:
+        assert (results[query] is True) == model_check(knowledge, query)
+
+
+@pytest.mark.parametrize(
+    "sentence, model, expected",
+    [
+        (And(A, B), {"A": False}, False),
+        (And(A, B), {"A": True}, None),
+        (Or(A, B), {"B": True}, True),
+        (Not(A), {}, None),
+        (Implication(A, B), {"A": False}, True),
+        (Implication(A, B), {"A": True, "B": False}, False),
+        (Biconditional(A, B), {"A": True}, None),
+        (Biconditional(A, B), {"A": True, "B": True}, True),
+    ],
+)
+def test_evaluate_partial(sentence, model, expected):
+    assert sentence.evaluate_partial(model) is expected
+
+
+def test_model_check_without_recursion_matches():
+    knowledge = And(Implication(A, B), Biconditional(B, Not(C)), Or(A, C))
+    queries = [A, B, C, Not(C), Or(Not(A), C)]
+    expected = model_check_all(knowledge, queries)
+    with patch.object(logic, "MAX_RECURSIVE_DEPTH", 0):
+        assert model_check_all(knowledge, queries) == expected
+
+
+def test_model_check_of_deep_knowledge():
+    knowledge = C
+    for i in range(3000):
+        knowledge = Or(And(knowledge, A), B) if i % 2 else And(Or(knowledge, C), A)
+    assert model_check(knowledge, Or(A, B))
+    assert model_check_all(knowledge, [A, B]) == {A: None, B: None}
+
+
+def test_model_check_prunes_falsified_branches():
+    symbols = [Symbol(f"P{i}") for i in range(10)]
+    knowledge = And(Not(symbols[0]), Or(*symbols))
+    stats = {}
+    assert model_check(knowledge, Not(symbols[0]), stats)
+    assert stats["nodes"] < 2 ** (len(symbols) + 1) - 1
+
+
+@pytest.mark.parametrize(
+    "sentence, expected",
+    [
+        (And(A, And(A, B)), And(A, B)),
+        (Or(A, Or(B, A)), Or(A, B)),
+        (And(A, Or(A, B)), A),
+        (Or(A, And(A, B)), A),
+        (And(A, Not(A)), FALSE),
+        (Or(A, Not(A)), TRUE),
+        (And(A, TRUE), A),
+        (Or(A, TRUE), TRUE),
+        (Not(Not(A)), A),
+        (Not(And(A, B)), Or(Not(A), Not(B))),
+        (Not(Or(A, B)), And(Not(A), Not(B))),
+        (Implication(A, B), Or(Not(A), B)),
+        (Not(Implication(A, B)), And(A, Not(B))),
+        (Biconditional(A, A), TRUE),
+        (Biconditional(A, FALSE), Not(A)),
+        (Not(Biconditional(A, B)), Biconditional(A, Not(B))),
+    ],
+)
+def test_simplify(sentence, expected):
+    assert simplify(sentence) is expected
+
+
+def test_simplify_preserves_meaning():
+    sentence = And(
+        Or(A, And(A, Not(B))),
+        Not(Implication(C, Biconditional(A, Not(Or(B, C))))),
+        Or(Not(Not(C)), And(B, Not(B))),
+    )
+    simplified = simplify(sentence)
+    for a in (True, False):
+        for b in (True, False):
+            for c in (True, False):
+                model = {"A": a, "B": b, "C": c}
+                assert simplified.evaluate(model) == sentence.evaluate(model)
+
+
+@pytest.mark.parametrize(
+    "sentence, expected",
+    [
+        (Not(Not(A)), "¬¬A"),
+        (Not(And(A, B)), "¬(A ∧ B)"),
+        (And(And(A, B), C), "(A ∧ B) ∧ C"),
+        (Or(And(A, B), Not(C)), "A ∧ B ∨ ¬C"),
+        (And(Or(A, B), C), "(A ∨ B) ∧ C"),
+        (Implication(And(A, B), Or(B, C)), "A ∧ B => B ∨ C"),
+        (Implication(Implication(A, B), C), "(A => B) => C"),
+        (Biconditional(Not(A), Implication(B, C)), "¬A <=> B => C"),
+        (
+            And(Symbol("A is a Knight"), Not(Symbol("B is a Knave"))),
+            "(A is a Knight) ∧ ¬(B is a Knave)",
+        ),
+        (And(Or(A)), "A"),
+        (Or(TRUE, FALSE), "⊤ ∨ ⊥"),
+    ],
+)
+def test_formula_parenthesizes_by_precedence(sentence, expected):
+    assert sentence.formula() == expected
+
+
+def test_repr():
+    sentence = Implication(A, Or(Not(B), C))
+    assert repr(sentence) == "Implication(A, Or(Not(B), C))"
+
+
+def test_formula_and_repr_of_deep_sentences():
+    sentence = A
+    for _ in range(10000):
+        sentence = Not(sentence)
+    assert sentence.formula() == "¬" * 10000 + "A"
+    assert repr(sentence) == "Not(" * 10000 + "A" + ")" * 10000
@@ -0,0 +1,74 @@
+import pytest
+
+from cs50_assignments.knowledge.knights.cnf import Clausifier
+from cs50_assignments.knowledge.knights.logic import (
+    FALSE,
+    TRUE,
+    And,
+    Biconditional,
+    Implication,
+    Not,
+    Or,
+    Symbol,
+)
+from cs50_assignments.knowledge.knights.parser import load, load_clauses, parse
+from cs50_assignments.knowledge.knights.puzzle import (
+    knowledge0,
+    knowledge1,
+    knowledge2,
+    knowledge3,
+)
+
+A, B, C = Symbol("A"), Symbol("B"), Symbol("C")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("A", A),
+        ("¬A", Not(A)),
+        ("¬¬A", Not(Not(A))),
+        ("A ∧ B ∧ C", And(A, B, C)),
+        ("(A ∧ B) ∧ C", And(And(A, B), C)),
+        ("A ∧ B ∨ C", Or(And(A, B), C)),
+        ("A ∨  ¬B ∧ C", Or(A, And(Not(B), C))),
+        ("A => B => C", Implication(A, Implication(B, C))),
+        ("A ∨ B <=> C", Biconditional(Or(A, B), C)),
+        ("¬(A ∨ B) => ⊥", Implication(Not(Or(A, B)), FALSE)),
+        ("⊤", TRUE),
+        (
+            "(A is a Knight) ∨ (A is a Knave)",
+            Or(Symbol("A is a Knight"), Symbol("A is a Knave")),
+        ),
+    ],
+)
+def test_parse(text, expected):
+    assert parse(text) is expected
+
+
+@pytest.mark.parametrize("knowledge", [knowledge0, knowledge1, knowledge2, knowledge3])
+def test_parse_round_trips_formula(knowledge):
+    assert parse(knowledge.formula()) is knowledge
+
+
+@pytest.mark.parametrize(
+    "text", ["", "A ∧", "∧ A", "(A ∨ B", "A ∨ B)", "A B ¬", "A < B"]
+)
+def test_parse_rejects_invalid_formulas(text):
+    with pytest.raises(ValueError):
+        parse(text)
+
+
+def test_load_skips_blank_and_comment_lines(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("# rules\nA ∨ B\n\n¬C\n", encoding="utf-8")
+    assert list(load(path)) == [Or(A, B), Not(C)]
+
+
+def test_load_clauses(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("A ∨ ¬B\nA ∨ ¬A\nB ∧ C\n", encoding="utf-8")
+    clausifier = Clausifier()
+    clauses = list(load_clauses(path, clausifier))
+    a, b, c = (clausifier.variable(name) for name in "ABC")
+    assert clauses == [(a, -b), (b,), (c,)]
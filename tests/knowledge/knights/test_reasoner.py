@@ -0,0 +1,95 @@
+import itertools
+
+import pytest
+
+from cs50_assignments.knowledge.knights.logic import (
+    And,
+    Biconditional,
+    Implication,
+    Not,
+    Or,
+    Symbol,
+    model_check,
+)
+from cs50_assignments.knowledge.knights.puzzle import (
+    AKnave,
+    AKnight,
+    BKnave,
+    BKnight,
+    CKnave,
+    CKnight,
+    knowledge0,
+    knowledge1,
+    knowledge2,
+    knowledge3,
+)
+from cs50_assignments.knowledge.knights.reasoner import Reasoner
+
+A, B, C = Symbol("A"), Symbol("B"), Symbol("C")
+
+
+@pytest.mark.parametrize("knowledge", [knowledge0, knowledge1, knowledge2, knowledge3])
+def test_entails_matches_model_check_on_puzzles(knowledge):
+    reasoner = Reasoner()
+    reasoner.add(knowledge)
+    for symbol in [AKnight, AKnave, BKnight, BKnave, CKnight, CKnave]:
+        assert reasoner.entails(symbol) == model_check(knowledge, symbol)
+
+
+def test_add_extends_knowledge_incrementally():
+    reasoner = Reasoner()
+    reasoner.add(Implication(A, B))
+    assert not reasoner.entails(B)
+    reasoner.add(A)
+    assert reasoner.entails(B)
+    reasoner.add(Biconditional(B, Not(C)))
+    assert reasoner.entails(Not(C))
+
+
+def test_entails_with_assumptions_does_not_change_knowledge():
+    reasoner = Reasoner()
+    reasoner.add(Implication(A, B))
+    reasoner.add(Implication(B, C))
+    assert reasoner.entails(C, assumptions=[A])
+    assert not reasoner.entails(C)
+    assert reasoner.entails(Not(A), assumptions=[Not(C)])
+    assert reasoner.satisfiable(assumptions=[A, C])
+    assert not reasoner.satisfiable(assumptions=[A, Not(C)])
+
+
+def test_inconsistent_knowledge_entails_everything():
+    reasoner = Reasoner()
+    reasoner.add(And(A, Not(A)))
+    assert not reasoner.satisfiable()
+    assert reasoner.entails(B)
+
+
+def test_learned_clauses_are_kept_between_queries():
+    holes = 3
+    pigeons = [[Symbol(f"P{i}H{j}") for j in range(holes)] for i in range(holes + 1)]
+    reasoner = Reasoner()
+    for pigeon in pigeons:
+        reasoner.add(Or(*pigeon))
+    for hole in range(holes):
+        for first, second in itertools.combinations(pigeons, 2):
+            reasoner.add(Or(Not(first[hole]), Not(second[hole])))
+
+    assert not reasoner.satisfiable()
+    learned = len(reasoner.learned)
+    assert learned > 0
+    assert reasoner.entails(A)
+    assert len(reasoner.learned) >= learned
+
+
+def test_decision_queue_does_not_grow_between_queries():
+    symbols = [Symbol(f"S{i}") for i in range(2000)]
+    reasoner = Reasoner()
+    for first, second in zip(symbols, symbols[1:]):
+        reasoner.add(Implication(first, second))
+
+    sizes = []
+    for _ in range(5):
+        assert reasoner.entails(symbols[-1], [symbols[0]])
+        sizes.append(len(reasoner.queue))
+    assert sizes[-1] <= 2 * len(symbols) + 16
+    assert max(sizes) == sizes[0]
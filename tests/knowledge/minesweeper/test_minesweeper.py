@@ -1,8 +1,17 @@
+import itertools
+import json
+import random
 from unittest.mock import patch
 
 import pytest
 
-from cs50_assignments.knowledge.minesweeper.minesweeper import MinesweeperAI, Sentence
+from cs50_assignments.knowledge.minesweeper.minesweeper import (
+    KnowledgeBase,
+    Minesweeper,
+    MinesweeperAI,
+    Sentence,
+    TrackedSet,
+)
 
 
 def test_known_mines_when_count_matches_number_of_cells():
@@ -157,3 +166,294 @@ def test_make_safe_move():
         assert safe_move is None
     else:
         assert safe_move in possible_safe_moves
+
+
+def test_knowledge_base_deduplicates_sentences():
+    knowledge = KnowledgeBase()
+    assert knowledge.add(Sentence({(0, 0), (0, 1)}, 1)) is not None
+    assert knowledge.add(Sentence({(0, 1), (0, 0)}, 1)) is None
+    assert len(knowledge) == 1
+    assert Sentence({(0, 0), (0, 1)}, 1) in knowledge
+
+
+def test_knowledge_base_drops_empty_sentences():
+    knowledge = KnowledgeBase()
+    assert knowledge.add(Sentence(set(), 0)) is None
+    knowledge.add(Sentence({(0, 0)}, 0))
+    knowledge.mark_safe((0, 0))
+    assert len(knowledge) == 0
+    assert knowledge.containing((0, 0)) == []
+
+
+def test_knowledge_base_marks_only_sentences_containing_cell():
+    knowledge = KnowledgeBase()
+    first = knowledge.add(Sentence({(0, 0), (0, 1)}, 1))
+    second = knowledge.add(Sentence({(2, 2), (2, 3)}, 1))
+    changed = knowledge.mark_mine((0, 0))
+    assert changed == [first]
+    assert first.cells == {(0, 1)} and first.count == 0
+    assert second.cells == {(2, 2), (2, 3)} and second.count == 1
+    assert knowledge.containing((0, 1)) == [first]
+
+
+def test_knowledge_base_drops_sentences_that_become_duplicates():
+    knowledge = KnowledgeBase()
+    knowledge.add(Sentence({(0, 0), (0, 1)}, 1))
+    knowledge.add(Sentence({(0, 0), (0, 1), (0, 2)}, 1))
+    assert knowledge.mark_safe((0, 2)) == []
+    assert len(knowledge) == 1
+    assert len(knowledge.containing((0, 0))) == 1
+
+
+def test_add_knowledge_chains_inferences_to_fixpoint():
+    ai = MinesweeperAI()
+    ai.knowledge.add(Sentence({(3, 0), (3, 1)}, 1))
+    ai.knowledge.add(Sentence({(3, 0), (3, 1), (3, 2)}, 2))
+    ai.knowledge.add(Sentence({(3, 2), (3, 3)}, 1))
+    ai.knowledge.add(Sentence({(3, 3), (3, 4), (3, 5)}, 1))
+    ai.add_knowledge((7, 7), 0)
+    assert (3, 2) in ai.mines
+    assert (3, 3) in ai.safes
+    assert Sentence({(3, 4), (3, 5)}, 1) in ai.knowledge
+
+
+def test_sentence_subset_and_difference():
+    small = Sentence({(1, 0), (1, 1)}, 1)
+    large = Sentence({(1, 0), (1, 1), (2, 0)}, 2)
+    assert small.is_proper_subset(large)
+    assert not large.is_proper_subset(small)
+    assert not small.is_proper_subset(small)
+    difference = large.difference(small)
+    assert difference == Sentence({(2, 0)}, 1)
+    assert difference.key() == Sentence({(2, 0)}, 1).key()
+
+
+def test_mine_probabilities_enumerate_component_configurations():
+    ai = MinesweeperAI(mines=40)
+    ai.knowledge.add(Sentence({(0, 0), (0, 1), (0, 2)}, 1))
+    ai.knowledge.add(Sentence({(0, 1), (0, 2), (0, 3)}, 2))
+    probabilities = ai.mine_probabilities({(0, 0), (0, 1), (0, 2), (0, 3)})
+    assert probabilities[(0, 0)] == 0
+    assert probabilities[(0, 1)] == pytest.approx(0.5)
+    assert probabilities[(0, 2)] == pytest.approx(0.5)
+    assert probabilities[(0, 3)] == 1
+
+
+def test_make_random_move_picks_least_likely_mine():
+    ai = MinesweeperAI(mines=40)
+    ai.knowledge.add(Sentence({(0, 0), (0, 1), (0, 2)}, 1))
+    ai.knowledge.add(Sentence({(0, 1), (0, 2), (0, 3)}, 2))
+    assert ai.make_random_move() == (0, 0)
+
+
+def test_mine_probabilities_fall_back_to_densities_past_node_budget():
+    cells = {(0, 0), (0, 1), (0, 2), (0, 3)}
+    sentences = [Sentence({(0, 0), (0, 1)}, 1), Sentence({(0, 1), (0, 2), (0, 3)}, 1)]
+
+    ai = MinesweeperAI(mines=40)
+    for sentence in sentences:
+        ai.knowledge.add(sentence)
+    assert ai.mine_probabilities(cells)[(0, 0)] == pytest.approx(2 / 3)
+
+    ai = MinesweeperAI(mines=40)
+    ai.MAX_ENUMERATION_NODES = 5
+    for sentence in sentences:
+        ai.knowledge.add(sentence)
+    assert ai.mine_probabilities(cells) == {
+        (0, 0): 0.5,
+        (0, 1): 0.5,
+        (0, 2): pytest.approx(1 / 3),
+        (0, 3): pytest.approx(1 / 3),
+    }
+
+
+def test_make_random_move_prefers_unconstrained_cells_when_frontier_is_risky():
+    ai = MinesweeperAI(mines=3)
+    ai.knowledge.add(Sentence({(0, 0), (0, 1), (0, 2)}, 2))
+    move = ai.make_random_move()
+    assert move not in {(0, 0), (0, 1), (0, 2)}
+
+
+@pytest.mark.parametrize("scan_limit", [0, KnowledgeBase.SCAN_LIMIT])
+def test_knowledge_base_finds_supersets_and_subsets(scan_limit):
+    knowledge = KnowledgeBase()
+    knowledge.SCAN_LIMIT = scan_limit
+    small = knowledge.add(Sentence({(0, 0), (0, 1)}, 1))
+    large = knowledge.add(Sentence({(0, 0), (0, 1), (0, 2)}, 1))
+    other = knowledge.add(Sentence({(0, 1), (0, 2)}, 1))
+    knowledge.add(Sentence({(5, 5), (5, 6)}, 1))
+
+    supersets, subsets = knowledge.supersets_and_subsets(small)
+    assert supersets == [large]
+    assert subsets == []
+    supersets, subsets = knowledge.supersets_and_subsets(large)
+    assert supersets == []
+    assert {id(sentence) for sentence in subsets} == {id(small), id(other)}
+
+
+def test_add_knowledge_many_matches_one_at_a_time():
+    random.seed(11)
+    game = Minesweeper(height=8, width=8, mines=6)
+    observations = [
+        (cell, game.nearby_mines(cell))
+        for cell in itertools.product(range(4), range(8))
+        if not game.is_mine(cell)
+    ]
+
+    one_at_a_time = MinesweeperAI(height=8, width=8)
+    for cell, count in observations:
+        one_at_a_time.add_knowledge(cell, count)
+    batched = MinesweeperAI(height=8, width=8)
+    batched.add_knowledge_many(observations)
+
+    assert batched.moves_made == one_at_a_time.moves_made
+    assert batched.mines == one_at_a_time.mines
+    assert batched.safes == one_at_a_time.safes
+
+
+def test_linear_solver_combines_more_than_two_sentences():
+    pairwise_ai = MinesweeperAI()
+    linear_ai = MinesweeperAI(solver="linear")
+    for ai in (pairwise_ai, linear_ai):
+        ai.knowledge.add(Sentence({(3, 2), (3, 3), (3, 4)}, 1))
+        ai.knowledge.add(Sentence({(3, 0), (3, 2), (3, 3)}, 2))
+        ai.knowledge.add(Sentence({(3, 1), (3, 4)}, 1))
+        ai.add_knowledge((7, 7), 0)
+
+    assert not pairwise_ai.mines
+    assert (3, 4) not in pairwise_ai.safes
+    assert linear_ai.mines == {(3, 0), (3, 1)}
+    assert (3, 4) in linear_ai.safes
+
+
+def test_linear_solver_keeps_deductions_between_intermediate_rows():
+    pairwise_ai = MinesweeperAI()
+    linear_ai = MinesweeperAI(solver="linear")
+    for ai in (pairwise_ai, linear_ai):
+        ai.knowledge.add(Sentence({(0, 0), (0, 5)}, 1))
+        ai.knowledge.add(Sentence({(0, 0), (0, 2), (0, 3), (0, 5)}, 3))
+        ai.knowledge.add(Sentence({(0, 3), (0, 4), (0, 5)}, 2))
+        ai.add_knowledge((7, 7), 0)
+
+    assert pairwise_ai.mines == {(0, 2), (0, 3)}
+    assert linear_ai.mines >= pairwise_ai.mines
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_linear_solver_deduces_everything_pairwise_does(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = Minesweeper(height=9, width=9, mines=10)
+    cells = sorted(set(itertools.product(range(9), range(9))) - game.mines)
+    rng.shuffle(cells)
+
+    pairwise_ai = MinesweeperAI(height=9, width=9)
+    linear_ai = MinesweeperAI(height=9, width=9, solver="linear")
+    for cell in cells[:40]:
+        for ai in (pairwise_ai, linear_ai):
+            ai.add_knowledge(cell, game.nearby_mines(cell))
+        assert linear_ai.mines >= pairwise_ai.mines
+        assert linear_ai.safes >= pairwise_ai.safes
+
+
+def test_linear_solver_only_marks_cells_correctly():
+    random.seed(5)
+    game = Minesweeper(height=8, width=8, mines=10)
+    ai = MinesweeperAI(solver="linear")
+    for cell in sorted(set(itertools.product(range(8), range(8))) - game.mines):
+        ai.add_knowledge(cell, game.nearby_mines(cell))
+        assert ai.mines <= game.mines
+        assert not ai.safes & game.mines
+    assert ai.mines == game.mines
+
+
+def test_unknown_solver_raises():
+    with pytest.raises(ValueError):
+        MinesweeperAI(solver="magic")
+
+
+def test_make_safe_move_skips_moves_made_since_marked_safe():
+    ai = MinesweeperAI()
+    ai.mark_safe((0, 0))
+    ai.mark_safe((0, 1))
+    ai.moves_made.add((0, 1))
+    assert ai.make_safe_move() == (0, 0)
+    ai.moves_made.add((0, 0))
+    assert ai.make_safe_move() is None
+
+
+def test_make_safe_move_sees_safes_changed_in_place():
+    ai = MinesweeperAI()
+    ai.mark_safe((0, 0))
+    ai.moves_made.add((0, 0))
+    ai.safes.discard((0, 0))
+    ai.safes.add((1, 1))
+    assert ai.make_safe_move() == (1, 1)
+
+    ai.safes |= {(4, 4), (5, 5)}
+    ai.safes -= {(1, 1)}
+    assert ai.make_safe_move() in {(4, 4), (5, 5)}
+
+    ai.moves_made = {(4, 4), (5, 5)}
+    assert ai.make_safe_move() is None
+    ai.moves_made.discard((5, 5))
+    assert ai.make_safe_move() == (5, 5)
+
+
+def test_tracked_set_reports_every_change():
+    added = []
+    removed = []
+    cells = TrackedSet({1, 2}, on_add=added.append, on_remove=removed.append)
+    cells.add(2)
+    cells.update({3, 4})
+    cells -= {1, 5}
+    cells ^= {2, 6}
+    cells &= {3, 6}
+    assert cells == {3, 6}
+    assert sorted(added) == [3, 4, 6]
+    assert sorted(removed) == [1, 2, 4]
+
+
+def test_make_random_move_skips_cells_no_longer_unknown():
+    ai = MinesweeperAI(height=2, width=2, best_guess=False)
+    ai.moves_made.add((0, 0))
+    ai.mark_mine((0, 1))
+    ai.knowledge.add(Sentence({(1, 0), (1, 1)}, 1))
+    assert ai.make_random_move() in {(1, 0), (1, 1)}
+    ai.mark_mine((1, 0))
+    ai.mark_safe((1, 1))
+    ai.moves_made.add((1, 1))
+    assert ai.make_random_move() is None
+
+
+def test_trace_records_every_add_knowledge_call(tmp_path):
+    ai = MinesweeperAI(trace=True)
+    ai.knowledge.add(Sentence({(3, 0), (3, 1)}, 1))
+    ai.knowledge.add(Sentence({(3, 0), (3, 1), (3, 2)}, 2))
+    ai.add_knowledge((7, 7), 0)
+    ai.add_knowledge_many([((0, 0), 0), ((0, 1), 0)])
+
+    assert [record["move"] for record in ai.trace] == [0, 1]
+    first = ai.trace[0]
+    assert first["knowledge_before"] == 2
+    assert first["iterations"] == len(first["inferred"])
+    assert first["comparisons"] > 0
+    assert (3, 2) in ai.mines
+    assert set(first["time"]) == {"mark", "observe", "infer"}
+    assert ai.trace[1]["observations"] == 2
+
+    path = tmp_path / "trace.json"
+    ai.write_trace(path)
+    assert json.loads(path.read_text()) == ai.trace
+
+    ai.write_trace(path, chrome=True)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [event["name"] for event in events if event["ph"] == "C"] == [
+        "knowledge",
+        "knowledge",
+    ]
+
+
+def test_write_trace_without_tracing_raises(tmp_path):
+    with pytest.raises(Exception):
+        MinesweeperAI().write_trace(tmp_path / "trace.json")
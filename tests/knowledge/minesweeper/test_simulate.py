@@ -0,0 +1,41 @@
+from cs50_assignments.knowledge.minesweeper.simulate import play, simulate
+
+
+def test_play_is_reproducible_for_a_seed():
+    first = play(8, 8, 8, seed=3)
+    second = play(8, 8, 8, seed=3)
+    assert first["won"] == second["won"]
+    assert first["moves"] == second["moves"]
+
+
+def test_play_reveals_every_safe_cell_when_won():
+    result = next(
+        result
+        for result in (play(4, 4, 1, seed=seed) for seed in range(20))
+        if result["won"]
+    )
+    assert result["moves"] == 4 * 4 - 1
+
+
+def test_simulate_summarises_games():
+    summary = simulate(5, height=6, width=6, density=0.1, processes=1, seed=7)
+    assert summary["games"] == 5
+    assert summary["mines"] == 4
+    assert len(summary["results"]) == 5
+    assert 0 <= summary["win_rate"] <= 1
+    assert [result["seed"] for result in summary["results"]] == [7, 8, 9, 10, 11]
+
+
+def test_simulate_in_a_process_pool_matches_serial_run():
+    serial = simulate(4, height=6, width=6, processes=1, seed=1)
+    pooled = simulate(4, height=6, width=6, processes=2, seed=1)
+    assert [(r["won"], r["moves"]) for r in serial["results"]] == [
+        (r["won"], r["moves"]) for r in pooled["results"]
+    ]
+
+
+def test_cascade_reveals_regions_in_fewer_moves():
+    results = [play(16, 16, 20, seed=seed, cascade=True) for seed in range(5)]
+    won = [result for result in results if result["won"]]
+    assert won
+    assert all(result["moves"] < 16 * 16 - 20 for result in won)
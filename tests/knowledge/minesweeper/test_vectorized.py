@@ -0,0 +1,76 @@
+import itertools
+
+import pytest
+
+from cs50_assignments.knowledge.minesweeper.minesweeper import Minesweeper
+from cs50_assignments.knowledge.minesweeper.vectorized import VectorizedMinesweeper
+
+
+def neighbors(game, cell):
+    for i in range(cell[0] - 1, cell[0] + 2):
+        for j in range(cell[1] - 1, cell[1] + 2):
+            if (i, j) != cell and 0 <= i < game.height and 0 <= j < game.width:
+                yield (i, j)
+
+
+def test_places_requested_number_of_mines():
+    game = VectorizedMinesweeper(height=10, width=12, mines=30, seed=1)
+    assert len(game.mines) == 30
+    assert int(game.board.sum()) == 30
+    assert all(game.is_mine(cell) for cell in game.mines)
+
+
+def test_same_seed_gives_same_board():
+    first = VectorizedMinesweeper(height=10, width=12, mines=30, seed=4)
+    second = VectorizedMinesweeper(height=10, width=12, mines=30, seed=4)
+    assert first.mines == second.mines
+
+
+def test_nearby_mines_matches_minesweeper():
+    game = VectorizedMinesweeper(height=9, width=7, mines=15, seed=2)
+    reference = Minesweeper(height=9, width=7, mines=0)
+    for i, j in game.mines:
+        reference.board[i][j] = True
+    for cell in itertools.product(range(9), range(7)):
+        assert game.nearby_mines(cell) == reference.nearby_mines(cell)
+
+
+@pytest.mark.parametrize("mines, seed", [(40, 3), (10, 0), (60, 1), (90, 2)])
+def test_reveal_opens_zero_region_and_its_border(mines, seed):
+    game = VectorizedMinesweeper(height=20, width=20, mines=mines, seed=seed)
+    start = next(
+        cell
+        for cell in itertools.product(range(20), range(20))
+        if not game.is_mine(cell) and game.nearby_mines(cell) == 0
+    )
+
+    expected = {start}
+    frontier = [start]
+    while frontier:
+        cell = frontier.pop()
+        if game.nearby_mines(cell) == 0:
+            for neighbor in neighbors(game, cell):
+                if neighbor not in expected:
+                    expected.add(neighbor)
+                    frontier.append(neighbor)
+
+    revealed = game.reveal(start)
+    assert {cell for cell, _ in revealed} == expected
+    assert all(count == game.nearby_mines(cell) for cell, count in revealed)
+    assert game.reveal(start) == []
+
+
+def test_reveal_of_numbered_cell_reveals_only_it():
+    game = VectorizedMinesweeper(height=20, width=20, mines=40, seed=3)
+    cell = next(
+        cell
+        for cell in itertools.product(range(20), range(20))
+        if not game.is_mine(cell) and game.nearby_mines(cell) > 0
+    )
+    assert game.reveal(cell) == [(cell, game.nearby_mines(cell))]
+
+
+def test_reveal_of_mine_raises():
+    game = VectorizedMinesweeper(height=5, width=5, mines=3, seed=0)
+    with pytest.raises(ValueError):
+        game.reveal(next(iter(game.mines)))
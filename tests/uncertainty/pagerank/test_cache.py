@@ -0,0 +1,66 @@
+import os
+from unittest.mock import patch
+
+from cs50_assignments.uncertainty.pagerank import cache
+from cs50_assignments.uncertainty.pagerank.cache import cache_path_of, load_graph
+
+
+def write_page(path, links, mtime):
+    path.write_text("".join(f'<a href="{link}">{link}</a>' for link in links))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_load_graph_reparses_only_changed_pages(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    write_page(corpus / "1.html", ["2.html"], 1)
+    write_page(corpus / "2.html", ["1.html", "3.html"], 1)
+
+    graph = load_graph(corpus, cache_directory=tmp_path / "cache")
+    assert graph.to_corpus() == {"1.html": {"2.html"}, "2.html": {"1.html"}}
+    assert cache_path_of(corpus.resolve(), tmp_path / "cache").exists()
+
+    # A link to a new page counts once the page exists, without reparsing
+    write_page(corpus / "3.html", ["1.html"], 1)
+    with patch.object(cache, "read_pages", wraps=cache.read_pages) as read_pages:
+        graph = load_graph(corpus, cache_directory=tmp_path / "cache")
+    assert [path.name for path in read_pages.call_args.args[0]] == ["3.html"]
+    assert graph.to_corpus() == {
+        "1.html": {"2.html"},
+        "2.html": {"1.html", "3.html"},
+        "3.html": {"1.html"},
+    }
+
+    write_page(corpus / "1.html", ["3.html"], 2)
+    (corpus / "2.html").unlink()
+    with patch.object(cache, "read_pages", wraps=cache.read_pages) as read_pages:
+        graph = load_graph(corpus, cache_directory=tmp_path / "cache")
+    assert [path.name for path in read_pages.call_args.args[0]] == ["1.html"]
+    assert graph.to_corpus() == {"1.html": {"3.html"}, "3.html": {"1.html"}}
+
+
+def test_load_graph_ignores_unreadable_cache(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    write_page(corpus / "1.html", ["2.html"], 1)
+    write_page(corpus / "2.html", [], 1)
+    path = cache_path_of(corpus.resolve(), tmp_path)
+    path.write_bytes(b"not a cache")
+
+    graph = load_graph(corpus, cache_directory=tmp_path)
+    assert graph.to_corpus() == {"1.html": {"2.html"}, "2.html": set()}
+
+
+def test_load_graph_ignores_truncated_cache(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    write_page(corpus / "1.html", ["2.html"], 1)
+    write_page(corpus / "2.html", ["1.html"], 1)
+    load_graph(corpus, cache_directory=tmp_path)
+    path = cache_path_of(corpus.resolve(), tmp_path)
+    data = path.read_bytes()
+
+    for size in (0, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:size])
+        graph = load_graph(corpus, cache_directory=tmp_path)
+        assert graph.to_corpus() == {"1.html": {"2.html"}, "2.html": {"1.html"}}
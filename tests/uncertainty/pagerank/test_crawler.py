@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from cs50_assignments.uncertainty.pagerank.crawler import crawl_graph, read_links
+
+CORPUS0 = Path(__file__).parents[3] / "cs50_assignments/uncertainty/pagerank/corpus0"
+
+
+def test_read_links_finds_links_split_across_chunks(tmp_path):
+    path = tmp_path / "1.html"
+    path.write_text(
+        '<p>text</p><a class="x" href="2.html">two</a> '
+        '<a href="3.html">three</a><a name="top">top</a>'
+    )
+    for chunk_size in (4, 7, 16, 1024):
+        assert read_links(path, chunk_size=chunk_size) == {"2.html", "3.html"}
+
+
+def test_crawl_graph_keeps_only_links_to_other_pages(tmp_path):
+    (tmp_path / "1.html").write_text('<a href="2.html">2</a><a href="1.html">1</a>')
+    (tmp_path / "2.html").write_text('<a href="https://example.com">out</a>')
+    (tmp_path / "notes.txt").write_text('<a href="1.html">1</a>')
+
+    graph = crawl_graph(tmp_path, processes=1)
+    assert graph.to_corpus() == {"1.html": {"2.html"}, "2.html": set()}
+
+
+def test_crawl_graph_in_a_process_pool_matches_serial_run():
+    serial = crawl_graph(CORPUS0, processes=1)
+    pooled = crawl_graph(CORPUS0, processes=2)
+    assert serial.to_corpus() == pooled.to_corpus()
+    assert serial.to_corpus() == {
+        "1.html": {"2.html"},
+        "2.html": {"1.html", "3.html"},
+        "3.html": {"2.html", "4.html"},
+        "4.html": {"2.html"},
+    }
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from cs50_assignments.uncertainty.pagerank.graph import LinkGraph
+
+CORPUS = {
+    "1.html": {"2.html", "3.html"},
+    "2.html": {"3.html"},
+    "3.html": set(),
+}
+
+
+def test_from_corpus_builds_compressed_rows():
+    graph = LinkGraph.from_corpus(CORPUS)
+    assert graph.pages == ["1.html", "2.html", "3.html"]
+    assert graph.indptr.tolist() == [0, 2, 3, 3]
+    assert graph.indices.tolist() == [1, 2, 2]
+    assert graph.dangling.tolist() == [False, False, True]
+    assert graph.to_corpus() == CORPUS
+
+
+def test_propagate_shares_rank_between_links():
+    graph = LinkGraph.from_corpus(CORPUS)
+    received = graph.propagate(np.array([0.5, 0.2, 0.3]))
+    assert received.tolist() == pytest.approx([0, 0.25, 0.45])
+
+
+def test_power_iteration_sums_to_1():
+    graph = LinkGraph.from_corpus(CORPUS)
+    ranks = graph.power_iteration(0.85)
+    assert ranks.sum() == pytest.approx(1)
+    assert graph.to_dict(ranks).keys() == CORPUS.keys()
+
+
+def test_sample_takes_every_sample():
+    graph = LinkGraph.from_corpus(CORPUS)
+    counts = graph.sample(0.85, 1001, walkers=10, rng=0)
+    assert counts.sum() == 1001
+
+
+def test_sample_is_reproducible_for_a_seed():
+    graph = LinkGraph.from_corpus(CORPUS)
+    first = graph.sample(0.85, 500, walkers=7, rng=3)
+    second = graph.sample(0.85, 500, walkers=7, rng=3)
+    assert first.tolist() == second.tolist()
+
+
+def test_step_follows_links_without_damping():
+    graph = LinkGraph.from_corpus(CORPUS)
+    positions = graph.step(np.array([0, 0, 1, 1]), 1, np.random.default_rng(0))
+    assert set(positions[:2].tolist()) <= {1, 2}
+    assert positions[2:].tolist() == [2, 2]
@@ -0,0 +1,36 @@
+import pytest
+
+from cs50_assignments.uncertainty.pagerank.montecarlo import estimate_pagerank
+from cs50_assignments.uncertainty.pagerank.pagerank import iterate_pagerank
+
+CORPUS = {
+    "1.html": {"2.html", "3.html"},
+    "2.html": {"3.html"},
+    "3.html": {"2.html"},
+    "4.html": set(),
+}
+
+
+def test_estimate_pagerank_intervals_contain_ranks():
+    expected = iterate_pagerank(CORPUS, 0.85)
+    result = estimate_pagerank(CORPUS, 0.85, 100000, processes=1, seed=1)
+
+    assert result["samples"] == 100000
+    assert sum(result["ranks"].values()) == pytest.approx(1)
+    for page, (low, high) in result["intervals"].items():
+        assert low <= result["ranks"][page] <= high
+        assert low - 0.002 <= expected[page] <= high + 0.002
+
+
+def test_estimate_pagerank_in_a_process_pool_matches_serial_run():
+    serial = estimate_pagerank(CORPUS, 0.85, 4000, processes=1, seed=2)
+    pooled = estimate_pagerank(CORPUS, 0.85, 4000, processes=2, seed=2)
+    assert serial["ranks"] == pooled["ranks"]
+
+
+def test_estimate_pagerank_stops_at_target_error():
+    result = estimate_pagerank(
+        CORPUS, 0.85, 1000000, processes=1, seed=3, target_error=0.01
+    )
+    assert result["samples"] < 1000000
+    assert result["error"] <= 0.01
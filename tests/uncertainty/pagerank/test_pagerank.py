@@ -1,8 +1,12 @@
+import random
+
 import pytest
 
 from cs50_assignments.uncertainty.pagerank.pagerank import (
     iterate_pagerank,
+    iterate_pagerank_sparse,
     sample_pagerank,
+    sample_pagerank_vectorized,
     transition_model,
 )
 
@@ -83,3 +87,111 @@ def test_iterate_pagerank_probabilities_sum_to_1():
 
     assert set(corpus.keys()) == set(result.keys())
     assert sum(result.values()) == pytest.approx(1, rel=1e-6)
+
+
+def test_iterate_pagerank_sparse_matches_iterate_pagerank():
+    random.seed(0)
+    pages = [f"{i}.html" for i in range(30)]
+    corpus = {
+        page: set(random.sample(pages, random.randint(0, 4))) - {page} for page in pages
+    }
+    expected = iterate_pagerank(corpus, 0.85)
+    result = iterate_pagerank_sparse(corpus, 0.85)
+
+    assert result.keys() == expected.keys()
+    for page in expected:
+        assert result[page] == pytest.approx(expected[page], abs=1e-9)
+
+
+def test_iterate_pagerank_leaves_corpus_untouched():
+    corpus = {
+        "1.html": {"2.html"},
+        "2.html": {"1.html", "3.html"},
+        "3.html": set(),
+    }
+    result = iterate_pagerank(corpus, 0.85)
+
+    assert corpus == {
+        "1.html": {"2.html"},
+        "2.html": {"1.html", "3.html"},
+        "3.html": set(),
+    }
+    # the dangling page's rank is shared with every page
+    assert result["1.html"] == pytest.approx(0.3032, abs=1e-3)
+    assert result["2.html"] == pytest.approx(0.3936, abs=1e-3)
+    assert result["3.html"] == pytest.approx(0.3032, abs=1e-3)
+
+
+def test_sample_pagerank_vectorized_approximates_iterate_pagerank():
+    corpus = {
+        "1.html": {"2.html", "3.html"},
+        "2.html": {"3.html"},
+        "3.html": {"2.html"},
+        "4.html": set(),
+    }
+    expected = iterate_pagerank(corpus, 0.85)
+    result = sample_pagerank_vectorized(corpus, 0.85, 200000, seed=0)
+
+    assert sum(result.values()) == pytest.approx(1)
+    for page in expected:
+        assert result[page] == pytest.approx(expected[page], abs=0.01)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"norm": "l1"},
+        {"gauss_seidel": True},
+        {"aitken": True},
+        {"gauss_seidel": True, "aitken": True, "norm": "l1"},
+    ],
+)
+def test_iterate_pagerank_convergence_options_reach_same_ranks(options):
+    random.seed(1)
+    pages = [f"{i}.html" for i in range(40)]
+    corpus = {
+        page: {pages[(i + random.randint(1, 3)) % 40] for _ in range(i % 3)}
+        for i, page in enumerate(pages)
+    }
+    expected = iterate_pagerank(corpus, 0.85, tolerance=1e-12)
+    result = iterate_pagerank(corpus, 0.85, tolerance=1e-10, **options)
+
+    assert sum(result.values()) == pytest.approx(1)
+    for page in expected:
+        assert result[page] == pytest.approx(expected[page], abs=1e-8)
+
+
+def test_iterate_pagerank_logs_every_update():
+    corpus = {
+        "1.html": {"2.html", "3.html"},
+        "2.html": {"3.html"},
+        "3.html": {"1.html"},
+    }
+    log = []
+    iterate_pagerank(corpus, 0.85, tolerance=1e-6, log=lambda *entry: log.append(entry))
+
+    assert [iteration for iteration, _ in log] == list(range(1, len(log) + 1))
+    assert log[-1][1] < 1e-6 <= log[-2][1]
+
+
+def test_iterate_pagerank_gauss_seidel_needs_fewer_updates_on_a_chain():
+    pages = [f"{i}.html" for i in range(50)]
+    corpus = {page: {pages[(i + 1) % 50]} for i, page in enumerate(pages[:-1])}
+    corpus[pages[-1]] = set()
+
+    jacobi = []
+    gauss_seidel = []
+    iterate_pagerank(corpus, 0.85, tolerance=1e-8, log=lambda *e: jacobi.append(e))
+    iterate_pagerank(
+        corpus,
+        0.85,
+        tolerance=1e-8,
+        gauss_seidel=True,
+        log=lambda *e: gauss_seidel.append(e),
+    )
+    assert len(gauss_seidel) < len(jacobi)
+
+
+def test_iterate_pagerank_unknown_norm_raises():
+    with pytest.raises(ValueError):
+        iterate_pagerank({"1.html": set()}, 0.85, norm="l2")